@@ -0,0 +1,60 @@
+"""
+File size, save time and load times of a synthetic corpus saved as .slpaa with every compression codec:
+
+    python -m benchmark.codec -n 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmark.synthetic import make_corpus
+from lexicon.corpus_io import CODECS, CorpusJournal
+
+
+def run_codec(corpus, path, codec):
+    start = time.perf_counter()
+    CorpusJournal(path, codec=codec).save(corpus)
+    save_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = CorpusJournal(path).load()
+    load_seconds = time.perf_counter() - start
+    assert len(loaded) == len(corpus)
+
+    # what opening a corpus in the GUI costs, then what reading every sign from it costs on top
+    start = time.perf_counter()
+    lazy = CorpusJournal(path).load(lazy=True)
+    lazy_load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    lazy.materialize_all()
+    materialize_seconds = time.perf_counter() - start
+
+    return {'codec': codec, 'bytes': os.path.getsize(path), 'save_seconds': save_seconds,
+            'load_seconds': load_seconds, 'lazy_load_seconds': lazy_load_seconds,
+            'materialize_seconds': materialize_seconds}
+
+
+def run(count, codecs=tuple(CODECS), seed=0):
+    corpus = make_corpus(count, seed)
+    with tempfile.TemporaryDirectory() as directory:
+        return [run_codec(corpus, os.path.join(directory, codec + '.slpaa'), codec) for codec in codecs]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.codec')
+    parser.add_argument('-n', '--count', type=int, default=20000, help='number of signs (default: 20000)')
+    parser.add_argument('--codec', action='append', choices=list(CODECS), help='codec to measure (default: all)')
+    args = parser.parse_args(argv)
+
+    results = run(args.count, args.codec or tuple(CODECS))
+    print('{} signs'.format(args.count))
+    print('{:<6} {:>12} {:>8} {:>8} {:>10} {:>12}'.format('codec', 'bytes', 'save', 'load', 'lazy load',
+                                                          'materialize'))
+    for result in results:
+        print('{codec:<6} {bytes:>12,} {save_seconds:>7.3f}s {load_seconds:>7.3f}s {lazy_load_seconds:>9.3f}s '
+              '{materialize_seconds:>11.3f}s'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Compare building signs from nested dicts (Sign.__init__) with Sign.from_flat:
+
+    python -m benchmark.sign_construction -n 20000
+"""
+import argparse
+import gc
+import time
+
+from benchmark.synthetic import get_rng, random_flat_sign, to_sign_dicts
+from lexicon.lexicon_classes import Sign
+
+
+def time_it(function, arguments):
+    # as timeit does, the garbage collector is kept out of the measurement
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        signs = [function(*argument) for argument in arguments]
+        return time.perf_counter() - start, signs
+    finally:
+        gc.enable()
+
+
+def run(count, seed=0):
+    rng = get_rng(seed)
+    flat_arguments = [random_flat_sign(rng, index) for index in range(count)]
+    dict_arguments = [to_sign_dicts(*arguments) for arguments in flat_arguments]
+
+    dict_seconds, dict_signs = time_it(Sign, dict_arguments)
+    flat_seconds, flat_signs = time_it(Sign.from_flat, flat_arguments)
+
+    # both paths have to produce the same transcriptions
+    for dict_sign, flat_sign in zip(dict_signs, flat_signs):
+        assert dict_sign.handshape_transcription == flat_sign.handshape_transcription
+
+    return {'signs': count, 'nested_dicts_seconds': dict_seconds, 'from_flat_seconds': flat_seconds,
+            'speedup': dict_seconds / flat_seconds}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.sign_construction')
+    parser.add_argument('-n', '--count', type=int, default=20000, help='number of signs (default: 20000)')
+    args = parser.parse_args(argv)
+
+    result = run(args.count)
+    print('{signs} signs: nested dicts {nested_dicts_seconds:.3f}s, Sign.from_flat {from_flat_seconds:.3f}s '
+          '({speedup:.1f}x)'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
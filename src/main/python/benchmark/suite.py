@@ -0,0 +1,153 @@
+"""
+Time the core corpus operations on synthetic corpora of several sizes and write the results as JSON, so that runs of
+different versions can be compared:
+
+    python -m benchmark.suite --sizes 1000 10000 100000 1000000 --label 0.0.0 -o results.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmark.synthetic import get_rng, iter_flat_signs, make_corpus, to_sign_dicts
+from constant import PREDEFINED_CODES
+from lexicon.corpus_io import CorpusJournal
+from lexicon.csv_export import export_csv
+from lexicon.lexicon_classes import HandshapeTranscription, Sign
+
+SIZES = [1000, 10000, 100000]
+REPEAT = 3
+# glosses looked up per measurement of the lookup operations
+LOOKUPS = 10000
+# signs edited before measuring an incremental save
+EDITS = 100
+# transcriptions built per measurement of the construction operations, at most the corpus size
+CONSTRUCTION_SAMPLE = 10000
+
+
+def measure(function, repeat=REPEAT):
+    """
+    Best time of repeat calls of function; as timeit does, the garbage collector is kept out of the measurement
+    """
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function()
+            seconds = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def lookup_operations(corpus, glosses):
+    def get_sign_by_gloss():
+        for gloss in glosses:
+            corpus.get_sign_by_gloss(gloss)
+
+    def get_previous_sign():
+        for gloss in glosses:
+            corpus.get_previous_sign(gloss)
+
+    return [('get_sign_by_gloss', len(glosses), get_sign_by_gloss),
+            ('get_sign_glosses', len(corpus), lambda: list(corpus.get_sign_glosses())),
+            ('get_previous_sign', len(glosses), get_previous_sign)]
+
+
+def storage_operations(corpus, directory, edited_signs):
+    path = os.path.join(directory, 'corpus.slpaa')
+    csv_path = os.path.join(directory, 'corpus.csv')
+    # incremental saves go to a file of their own, which already holds the snapshot they append to
+    journal = CorpusJournal(os.path.join(directory, 'incremental.slpaa'))
+    journal.save(corpus)
+
+    def save_incremental():
+        for sign in edited_signs:
+            corpus.add_sign(sign)
+        journal.save(corpus)
+
+    # a new journal always writes a whole snapshot
+    return [('save', len(corpus), lambda: CorpusJournal(path).save(corpus)),
+            ('save_incremental', len(edited_signs), save_incremental),
+            ('load', len(corpus), lambda: CorpusJournal(path).load()),
+            ('load_lazy', len(corpus), lambda: CorpusJournal(path).load(lazy=True)),
+            ('export_csv_individual', len(corpus), lambda: export_csv(corpus, csv_path, 'individual')),
+            ('export_csv_single', len(corpus), lambda: export_csv(corpus, csv_path, 'single'))]
+
+
+def transcription_operations(flat_signs, transcriptions):
+    symbols = [(arguments[6], arguments[7], arguments[8]) for arguments in flat_signs]
+    configs = [to_sign_dicts(*arguments)[2] for arguments in flat_signs]
+    hands = [hand for transcription in transcriptions for config in (transcription.config1, transcription.config2)
+             for hand in config]
+
+    return [('transcription_from_dicts', len(configs), lambda: [HandshapeTranscription(config) for config in configs]),
+            ('transcription_from_symbols', len(symbols),
+             lambda: [HandshapeTranscription.from_symbols(*arguments) for arguments in symbols]),
+            ('predefined_match', len(hands), lambda: [PREDEFINED_CODES.get(hand.get_hand_codes()) for hand in hands])]
+
+
+def run_size(count, repeat=REPEAT, seed=0):
+    corpus = make_corpus(count, seed)
+    rng = get_rng(seed + 1)
+    glosses = corpus.get_sign_glosses()
+    lookup_glosses = [glosses[rng.randrange(count)] for _ in range(LOOKUPS)]
+    # edits replace existing signs with new transcriptions of the same glosses
+    edited_signs = [Sign.from_flat(glosses[rng.randrange(count)], *arguments[1:])
+                    for arguments in iter_flat_signs(min(EDITS, count), seed + 2)]
+    flat_signs = list(iter_flat_signs(min(CONSTRUCTION_SAMPLE, count), seed))
+    transcriptions = [corpus.get_sign_by_gloss(arguments[0]).handshape_transcription for arguments in flat_signs]
+
+    results = list()
+    with tempfile.TemporaryDirectory() as directory:
+        operations = lookup_operations(corpus, lookup_glosses) + storage_operations(corpus, directory, edited_signs) + \
+            transcription_operations(flat_signs, transcriptions)
+        for operation, items, function in operations:
+            seconds = measure(function, repeat)
+            results.append({'operation': operation, 'signs': count, 'items': items, 'seconds': seconds,
+                            'microseconds_per_item': seconds / items * 1e6})
+    return results
+
+
+def run(sizes=SIZES, repeat=REPEAT, seed=0, label=None, progress=None):
+    results = list()
+    for count in sizes:
+        results.extend(run_size(count, repeat, seed))
+        if progress is not None:
+            progress(count)
+    return {'label': label, 'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(), 'repeat': repeat, 'seed': seed,
+            'results': results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.suite')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help='corpus sizes to run (default: {})'.format(' '.join(map(str, SIZES))))
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='runs per operation, the best one is kept '
+                                                                   '(default: {})'.format(REPEAT))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--label', help='recorded with the results, e.g. the version or commit measured')
+    parser.add_argument('-o', '--output', help='JSON file to write (default: standard output)')
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.repeat, args.seed, args.label,
+                 progress=lambda count: print('{} signs done'.format(count), file=sys.stderr))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
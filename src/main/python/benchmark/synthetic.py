@@ -0,0 +1,114 @@
+"""
+Synthetic signs for the benchmarks; hands are drawn from the canonical forms of the predefined handshapes,
+and some of them are varied in a few slots so that not every hand matches a predefined handshape
+"""
+import random
+from copy import deepcopy
+from datetime import date
+
+from constant import PREDEFINED_MAP, SAMPLE_LOCATIONS
+from lexicon.lexicon_classes import Corpus, Sign, FIELD_SLOTS, HAND_SLOTS, SLOTS_PER_HAND
+from lexicon.slot_options import SLOT_OPTIONS, get_option_symbol
+
+CANONICAL_HANDS = [handshape.canonical for name, handshape in PREDEFINED_MAP.items() if name != 'empty']
+EMPTY_HAND = PREDEFINED_MAP['empty'].canonical
+GLOBAL_FLAG_NAMES = ['forearm', 'estimated', 'uncertain', 'incomplete', 'fingerspelled', 'initialized']
+# (position in a hand, symbols a coder could pick there) for every editable slot
+EDITABLE_SLOTS = [(HAND_SLOTS.index(slot_number), [get_option_symbol(option) for option in options])
+                  for slot_number, options in SLOT_OPTIONS.items()]
+
+# share of transcribed hands that differ from their predefined handshape, in 1 to 3 slots
+VARIANT_PROBABILITY = 0.3
+
+
+def random_hand(rng, variant_probability=VARIANT_PROBABILITY):
+    hand = rng.choice(CANONICAL_HANDS)
+    if rng.random() >= variant_probability:
+        return hand
+    hand = list(hand)
+    for position, symbols in rng.sample(EDITABLE_SLOTS, rng.randint(1, 3)):
+        hand[position] = rng.choice(symbols)
+    return hand
+
+
+def random_symbols(rng, variant_probability=VARIANT_PROBABILITY):
+    """
+    Symbols of the four hands (C1H1, C1H2, C2H1, C2H2); about half of the signs are one-handed, and a quarter of them
+    have a second config
+    """
+    two_handed = rng.random() < 0.5
+    two_config = rng.random() < 0.25
+    hands = [random_hand(rng, variant_probability),
+             random_hand(rng, variant_probability) if two_handed else EMPTY_HAND,
+             random_hand(rng, variant_probability) if two_config else EMPTY_HAND,
+             random_hand(rng, variant_probability) if two_config and two_handed else EMPTY_HAND]
+    return [symbol for hand in hands for symbol in hand]
+
+
+def random_flags(rng, probability=0.02):
+    flags = 0
+    for position in range(4 * SLOTS_PER_HAND):
+        if rng.random() < probability:
+            flags |= 1 << position
+    return flags
+
+
+def random_flat_sign(rng, index):
+    """
+    Arguments of Sign.from_flat for the index-th synthetic sign
+    """
+    return ('sign{:07d}'.format(index), float(rng.randint(1, 100)), 'coder{}'.format(rng.randint(1, 5)),
+            date(2020, rng.randint(1, 12), rng.randint(1, 28)), '', [False] * len(GLOBAL_FLAG_NAMES),
+            random_symbols(rng), random_flags(rng), random_flags(rng))
+
+
+def to_sign_dicts(gloss, frequency, coder, update_date, note, global_flags, symbols, estimate_flags, uncertain_flags):
+    """
+    The same sign as the nested dicts Sign.__init__ takes, as the GUI panels produce them
+    """
+    lexical_info = {'gloss': gloss, 'frequency': frequency, 'coder': coder, 'date': update_date, 'note': note}
+    global_hand_info = dict(zip(GLOBAL_FLAG_NAMES, global_flags))
+
+    configs = list()
+    for config_number in (1, 2):
+        hands = list()
+        for hand_number in (1, 2):
+            hand_offset = ((config_number - 1) * 2 + hand_number - 1) * SLOTS_PER_HAND
+            fields = list()
+            for field_number, slot_numbers in FIELD_SLOTS.items():
+                slots = list()
+                for slot_number in slot_numbers:
+                    position = hand_offset + HAND_SLOTS.index(slot_number)
+                    slots.append({'slot_number': slot_number, 'symbol': symbols[position],
+                                  'estimate': bool(estimate_flags >> position & 1),
+                                  'uncertain': bool(uncertain_flags >> position & 1)})
+                fields.append({'field_number': field_number, 'slots': slots})
+            hands.append({'hand_number': hand_number, 'fields': fields})
+        configs.append({'config_number': config_number, 'hands': hands})
+
+    location_transcription_info = {
+        'start': {'contact': 0, 'D': [], 'W': []},
+        'end': {'contact': 0, 'D': [], 'W': []}
+    }
+    return lexical_info, global_hand_info, configs, location_transcription_info
+
+
+def get_rng(seed=0):
+    return random.Random(seed)
+
+
+def iter_flat_signs(count, seed=0):
+    """
+    Yield the Sign.from_flat arguments of count synthetic signs; the same seed always gives the same signs
+    """
+    rng = get_rng(seed)
+    for index in range(count):
+        yield random_flat_sign(rng, index)
+
+
+def make_corpus(count, seed=0):
+    corpus = Corpus(name='synthetic', location_definition=deepcopy(SAMPLE_LOCATIONS))
+    for arguments in iter_flat_signs(count, seed):
+        corpus.add_sign(Sign.from_flat(*arguments))
+    corpus.clear_pending_changes()
+    return corpus
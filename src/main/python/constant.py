@@ -1,4 +1,4 @@
-from lexicon.lexicon_classes import LocationParameter, Locations
+from lexicon.lexicon_classes import LocationParameter, Locations, encode_symbols
 from lexicon.predefined_handshape import (
     Handshape1, Handshape5, HandshapeA, HandshapeB1, HandshapeB2, HandshapeBase, HandshapeC, HandshapeO, HandshapeS, HandshapeEmpty,
     HandshapeExtendedA, HandshapeClosedAIndex, HandshapeOpenA, HandshapeModifiedA,
@@ -318,4 +318,8 @@ PREDEFINED_MAP = {
         'extended-8': HandshapeExtended8(),
         'open-8': HandshapeOpen8(),
         'middle-finger': HandshapeMiddleFinger()
-    }
\ No newline at end of file
+    }
+
+# predefined handshapes by the SYMBOL_CODES of their canonical form, matched against
+# HandshapeTranscriptionHand.get_hand_codes() without decoding the transcription
+PREDEFINED_CODES = {bytes(encode_symbols(handshape.canonical)): handshape for handshape in PREDEFINED_MAP.values()}
@@ -29,6 +29,11 @@ class CorpusModel(QAbstractListModel):
     def rowCount(self, index):
         return len(self.glosses)
 
+    def set_glosses(self, glosses):
+        self.beginResetModel()
+        self.glosses = glosses
+        self.endResetModel()
+
 
 class CorpusView(QWidget):
     selected_gloss = pyqtSignal(str)
@@ -54,10 +59,8 @@ class CorpusView(QWidget):
         self.selected_gloss.emit(gloss)
 
     def updated_glosses(self, glosses, current_gloss):
-        self.corpus_model.glosses.clear()
-        self.corpus_model.glosses.extend(glosses)
-        self.corpus_model.glosses.sort()
-        self.corpus_model.layoutChanged.emit()
+        # glosses come from the corpus already sorted; the model keeps a copy, since the corpus changes them in place
+        self.corpus_model.set_glosses(list(glosses))
 
         index = self.corpus_model.glosses.index(current_gloss)
 
@@ -65,14 +68,8 @@ class CorpusView(QWidget):
         self.corpus_view.selectionModel().setCurrentIndex(self.corpus_view.model().index(index, 0),
                                                           QItemSelectionModel.SelectCurrent)
 
-    def remove_gloss(self, gloss):
-        self.corpus_model.glosses.remove(gloss)
-        self.corpus_model.layoutChanged.emit()
-        self.corpus_view.clearSelection()
-
     def clear(self):
         self.corpus_title.setText('Untitled')
 
-        self.corpus_model.glosses.clear()
-        self.corpus_model.layoutChanged.emit()
+        self.corpus_model.set_glosses([])
         self.corpus_view.clearSelection()
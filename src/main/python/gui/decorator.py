@@ -55,10 +55,10 @@ def check_duplicated_gloss(func):
             return
         else:
             if self.current_sign:
-                if lexical_info['gloss'] == self.current_sign.lexical_information.gloss or lexical_info['gloss'] not in self.corpus.get_sign_glosses():
+                if lexical_info['gloss'] == self.current_sign.lexical_information.gloss or not self.corpus.has_gloss(lexical_info['gloss']):
                     return func(self, *args, **kwargs)
 
-            if lexical_info['gloss'] in self.corpus.get_sign_glosses():
+            if self.corpus.has_gloss(lexical_info['gloss']):
                 QMessageBox.critical(self, 'Duplicated Gloss',
                                      'Please use a different gloss. Duplicated glosses are not allowed.')
                 return
@@ -75,7 +75,7 @@ def check_unsaved_corpus(func):
                                                        self.tr('Save Corpus'),
                                                        os.path.join(self.app_settings['storage']['recent_folder'],
                                                                     'corpus.slpaa'),
-                                                       self.tr('SLAP-AA Corpus (*.slpaa)'))
+                                                       self.tr('SLAP-AA Corpus (*.slpaa);;SLAP-AA Database (*.slpaadb)'))
             if file_name:
                 self.corpus.path = file_name
                 folder, _ = os.path.split(file_name)
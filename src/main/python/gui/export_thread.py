@@ -0,0 +1,36 @@
+from PyQt5.QtCore import (
+    QThread,
+    pyqtSignal
+)
+
+from lexicon.csv_export import export_csv
+
+
+class ExportCSVThread(QThread):
+    """
+    Run lexicon.csv_export.export_csv off the GUI thread
+    """
+    progress = pyqtSignal(int, int)
+    exported = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, corpus, file_name, option, **kwargs):
+        super().__init__(**kwargs)
+        self.corpus = corpus
+        self.file_name = file_name
+        self.option = option
+
+    def run(self):
+        # a LazyCorpus is read as it is: it unpickles its signs under its file_lock, so the GUI can keep editing it;
+        # an SQLite corpus is read through a connection of the worker's own
+        corpus = self.corpus.open_reader()
+
+        try:
+            count = export_csv(corpus, self.file_name, self.option, progress=self.progress.emit)
+        except (OSError, ValueError) as error:
+            self.failed.emit(str(error))
+        else:
+            self.exported.emit(count)
+        finally:
+            if corpus is not self.corpus:
+                corpus.close()
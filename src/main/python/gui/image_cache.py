@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import (
+    QImage,
+    QPixmap
+)
+
+# scaled images kept at once; the hand illustrations and the predefined handshape images together are well under this
+IMAGE_CACHE_CAPACITY = 256
+
+
+def load_scaled_image(path, width, height):
+    return QImage(path).scaled(width, height, Qt.KeepAspectRatio)
+
+
+class ImageCache:
+    """
+    Scaled images by (resource path, width, height); the least recently used one is dropped once more than capacity
+    are held.
+    prefetch() decodes and scales images on a background thread as QImages, which unlike QPixmaps may be built off the
+    GUI thread; get_pixmap() turns them into QPixmaps on the GUI thread the first time they are asked for.
+    """
+    def __init__(self, capacity=IMAGE_CACHE_CAPACITY):
+        self.capacity = capacity
+        # key -> QImage (prefetched, not shown yet) or QPixmap
+        self.images = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_pixmap(self, path, size):
+        key = (path, size.width(), size.height())
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+        if image is None:
+            image = load_scaled_image(*key)
+        if isinstance(image, QImage):
+            image = QPixmap.fromImage(image)
+            with self.lock:
+                self.add(key, image)
+        return image
+
+    def add(self, key, image):
+        # called with self.lock held
+        self.images[key] = image
+        self.images.move_to_end(key)
+        while len(self.images) > self.capacity:
+            self.images.popitem(last=False)
+
+    def prefetch(self, paths, size):
+        """
+        Load the images at paths scaled to size on a background thread
+        """
+        keys = [(path, size.width(), size.height()) for path in paths]
+        thread = threading.Thread(target=self.load_all, args=(keys,), name='ImageCachePrefetch', daemon=True)
+        thread.start()
+        return thread
+
+    def load_all(self, keys):
+        for key in keys:
+            with self.lock:
+                if key in self.images:
+                    continue
+            image = load_scaled_image(*key)
+            with self.lock:
+                # an image shown meanwhile is already in the cache as a QPixmap
+                if key not in self.images:
+                    self.add(key, image)
+
+
+# shared by every panel showing hand illustrations or predefined handshape images
+IMAGE_CACHE = ImageCache()
@@ -1,7 +1,5 @@
 import os
-import pickle
 import json
-import csv
 from collections import defaultdict
 from copy import deepcopy
 #from getpass import getuser
@@ -11,6 +9,7 @@ from PyQt5.QtCore import (
     QSize,
     QSettings,
     QPoint,
+    QObject,
     pyqtSignal
 )
 from PyQt5.QtWidgets import (
@@ -28,8 +27,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import (
     QIcon,
-    QKeySequence,
-    QPixmap
+    QKeySequence
 )
 
 # Ref: https://chrisyeh96.github.io/2017/08/08/definitive-guide-python-imports.html
@@ -38,6 +36,7 @@ from gui.corpus_view import CorpusView
 from gui.location_definer import LocationDefinerDialog
 from gui.corpus_summary_dialog import CorpusSummaryDialog
 from gui.export_csv_dialog import ExportCSVDialog
+from gui.export_thread import ExportCSVThread
 from gui.panel import (
     LexicalInformationPanel,
     HandTranscriptionPanel,
@@ -53,6 +52,18 @@ from lexicon.lexicon_classes import (
     Corpus,
     Sign
 )
+from lexicon.autosave import CorpusAutosaver
+from lexicon.corpus_io import CorpusJournal, DEFAULT_CODEC
+from lexicon.csv_import import import_csv
+from lexicon.sqlite_corpus import SqliteCorpus, is_sqlite_corpus_path
+
+
+class AutosaveNotifier(QObject):
+    """
+    Carry the callbacks of lexicon.autosave.CorpusAutosaver from its worker thread to the GUI thread
+    """
+    saved = pyqtSignal()
+    failed = pyqtSignal(str)
 
 
 class SubWindow(QMdiSubWindow):
@@ -76,6 +87,12 @@ class MainWindow(QMainWindow):
         self.app_ctx = app_ctx
 
         self.corpus = None
+        self.corpus_journal = None
+        self.autosaver = None
+        self.autosave_notifier = AutosaveNotifier(parent=self)
+        self.autosave_notifier.saved.connect(self.on_autosave_saved)
+        self.autosave_notifier.failed.connect(self.on_autosave_failed)
+        self.export_thread = None
         self.current_sign = None
 
         self.undostack = QUndoStack(parent=self)
@@ -169,8 +186,16 @@ class MainWindow(QMainWindow):
         action_close.setCheckable(False)
 
         # output handshape transcription to csv
-        action_export_handshape_transcription_csv = QAction('Export handshape transcription as CSV...', parent=self)
-        action_export_handshape_transcription_csv.triggered.connect(self.on_action_export_handshape_transcription_csv)
+        self.action_export_handshape_transcription_csv = QAction('Export handshape transcription as CSV...',
+                                                                 parent=self)
+        self.action_export_handshape_transcription_csv.triggered.connect(
+            self.on_action_export_handshape_transcription_csv)
+
+        # input handshape transcription from csv
+        action_import_handshape_transcription_csv = QAction('Import handshape transcription from CSV...',
+                                                            parent=self)
+        action_import_handshape_transcription_csv.triggered.connect(
+            self.on_action_import_handshape_transcription_csv)
 
         # new sign
         action_new_sign = QAction(QIcon(self.app_ctx.icons['plus']), 'New sign', parent=self)
@@ -279,7 +304,8 @@ class MainWindow(QMainWindow):
         menu_file.addAction(action_new_corpus)
         menu_file.addAction(action_load_corpus)
         menu_file.addSeparator()
-        menu_file.addAction(action_export_handshape_transcription_csv)
+        menu_file.addAction(action_import_handshape_transcription_csv)
+        menu_file.addAction(self.action_export_handshape_transcription_csv)
         menu_file.addSeparator()
         menu_file.addAction(action_close)
         menu_file.addAction(action_save)
@@ -369,87 +395,51 @@ class MainWindow(QMainWindow):
             file_name = export_csv_dialog.location_group.get_file_path()
             option = export_csv_dialog.transcription_option_group.get_selected_option()
             if file_name:
-                with open(file_name, 'w') as f:
-                    transcription_writer = csv.writer(f, delimiter=',', quoting=csv.QUOTE_MINIMAL)
-                    if option == 'individual':
-                        transcription_writer.writerow(
-                            ['GLOSS', 'FREQUENCY', 'CODER', 'LAST_UPDATED', 'NOTES', 'FOREARM', 'ESTIMATED',
-                             'UNCERTAIN',
-                             'INCOMPLETE', 'FINGERSPELLED', 'INITIALIZED',
-                             'C1H1_S2', 'C1H1_S3', 'C1H1_S4', 'C1H1_S5', 'C1H1_S6', 'C1H1_S7', 'C1H1_S8', 'C1H1_S9',
-                             'C1H1_S10', 'C1H1_S11', 'C1H1_S12', 'C1H1_S13', 'C1H1_S14', 'C1H1_S15', 'C1H1_S16',
-                             'C1H1_S17',
-                             'C1H1_S18', 'C1H1_S19', 'C1H1_S20', 'C1H1_S21', 'C1H1_S22', 'C1H1_S23', 'C1H1_S24',
-                             'C1H1_S25',
-                             'C1H1_S26', 'C1H1_S27', 'C1H1_S28', 'C1H1_S29', 'C1H1_S30', 'C1H1_S31', 'C1H1_S32',
-                             'C1H1_S33',
-                             'C1H1_S34',
-                             'C1H2_S2', 'C1H2_S3', 'C1H2_S4', 'C1H2_S5', 'C1H2_S6', 'C1H2_S7', 'C1H2_S8', 'C1H2_S9',
-                             'C1H2_S10', 'C1H2_S11', 'C1H2_S12', 'C1H2_S13', 'C1H2_S14', 'C1H2_S15', 'C1H2_S16',
-                             'C1H2_S17',
-                             'C1H2_S18', 'C1H2_S19', 'C1H2_S20', 'C1H2_S21', 'C1H2_S22', 'C1H2_S23', 'C1H2_S24',
-                             'C1H2_S25',
-                             'C1H2_S26', 'C1H2_S27', 'C1H2_S28', 'C1H2_S29', 'C1H2_S30', 'C1H2_S31', 'C1H2_S32',
-                             'C1H2_S33',
-                             'C1H2_S34',
-                             'C2H1_S2', 'C2H1_S3', 'C2H1_S4', 'C2H1_S5', 'C2H1_S6', 'C2H1_S7', 'C2H1_S8', 'C2H1_S9',
-                             'C2H1_S10', 'C2H1_S11', 'C2H1_S12', 'C2H1_S13', 'C2H1_S14', 'C2H1_S15', 'C2H1_S16',
-                             'C2H1_S17',
-                             'C2H1_S18', 'C2H1_S19', 'C2H1_S20', 'C2H1_S21', 'C2H1_S22', 'C2H1_S23', 'C2H1_S24',
-                             'C2H1_S25',
-                             'C2H1_S26', 'C2H1_S27', 'C2H1_S28', 'C2H1_S29', 'C2H1_S30', 'C2H1_S31', 'C2H1_S32',
-                             'C2H1_S33',
-                             'C2H1_S34',
-                             'C2H2_S2', 'C2H2_S3', 'C2H2_S4', 'C2H2_S5', 'C2H2_S6', 'C2H2_S7', 'C2H2_S8', 'C2H2_S9',
-                             'C2H2_S10', 'C2H2_S11', 'C2H2_S12', 'C2H2_S13', 'C2H2_S14', 'C2H2_S15', 'C2H2_S16',
-                             'C2H2_S17',
-                             'C2H2_S18', 'C2H2_S19', 'C2H2_S20', 'C2H2_S21', 'C2H2_S22', 'C2H2_S23', 'C2H2_S24',
-                             'C2H2_S25',
-                             'C2H2_S26', 'C2H2_S27', 'C2H2_S28', 'C2H2_S29', 'C2H2_S30', 'C2H2_S31', 'C2H2_S32',
-                             'C2H2_S33',
-                             'C2H2_S34'
-                             ])
-
-                        for sign in self.corpus:
-                            info = [sign.lexical_information.gloss, sign.lexical_information.frequency,
-                                    sign.lexical_information.coder, str(sign.lexical_information.update_date),
-                                    sign.lexical_information.note,
-                                    sign.global_handshape_information.forearm,
-                                    sign.global_handshape_information.estimated,
-                                    sign.global_handshape_information.uncertain,
-                                    sign.global_handshape_information.incomplete,
-                                    sign.global_handshape_information.fingerspelled,
-                                    sign.global_handshape_information.initialized]
-                            info.extend(sign.handshape_transcription.config1.hand1.get_hand_transcription_list())
-                            info.extend(sign.handshape_transcription.config1.hand2.get_hand_transcription_list())
-                            info.extend(sign.handshape_transcription.config2.hand1.get_hand_transcription_list())
-                            info.extend(sign.handshape_transcription.config2.hand2.get_hand_transcription_list())
-                            transcription_writer.writerow(info)
-                    elif option == 'single':
-                        transcription_writer.writerow(
-                            ['GLOSS', 'FREQUENCY', 'CODER', 'LAST_UPDATED', 'NOTES', 'FOREARM', 'ESTIMATED',
-                             'UNCERTAIN',
-                             'INCOMPLETE', 'FINGERSPELLED', 'INITIALIZED',
-                             'C1H1', 'C1H2', 'C2H1', 'C2H2'])
-
-                        for sign in self.corpus:
-                            info = [sign.lexical_information.gloss, sign.lexical_information.frequency,
-                                    sign.lexical_information.coder, str(sign.lexical_information.update_date),
-                                    sign.lexical_information.note,
-                                    sign.global_handshape_information.forearm,
-                                    sign.global_handshape_information.estimated,
-                                    sign.global_handshape_information.uncertain,
-                                    sign.global_handshape_information.incomplete,
-                                    sign.global_handshape_information.fingerspelled,
-                                    sign.global_handshape_information.initialized,
-                                    sign.handshape_transcription.config1.hand1.get_hand_transcription_string(),
-                                    sign.handshape_transcription.config1.hand2.get_hand_transcription_string(),
-                                    sign.handshape_transcription.config2.hand1.get_hand_transcription_string(),
-                                    sign.handshape_transcription.config2.hand2.get_hand_transcription_string()]
-                            transcription_writer.writerow(info)
-
-                QMessageBox.information(self, 'Handshape Transcriptions Exported',
-                                        'Handshape transcriptions have been successfully exported!')
+                # the export runs in a worker thread, so the window stays responsive on large corpora
+                self.action_export_handshape_transcription_csv.setEnabled(False)
+                self.export_thread = ExportCSVThread(self.corpus, file_name, option, parent=self)
+                self.export_thread.progress.connect(self.on_export_progress)
+                self.export_thread.exported.connect(self.on_export_finished)
+                self.export_thread.failed.connect(self.on_export_failed)
+                self.export_thread.finished.connect(
+                    lambda: self.action_export_handshape_transcription_csv.setEnabled(True))
+                self.export_thread.start()
+
+    def on_action_import_handshape_transcription_csv(self):
+        file_name, _ = QFileDialog.getOpenFileName(self,
+                                                   self.tr('Import Handshape Transcriptions'),
+                                                   self.app_settings['storage']['recent_folder'],
+                                                   self.tr('CSV Files (*.csv)'))
+        if not file_name:
+            return
+
+        try:
+            imported, problems = import_csv(file_name, self.corpus)
+        except (OSError, ValueError) as error:
+            QMessageBox.critical(self, 'Import Failed', 'Handshape transcriptions could not be imported: ' + str(error))
+            return
+
+        glosses = self.corpus.get_sign_glosses()
+        if glosses:
+            self.corpus_view.updated_glosses(glosses, glosses[0])
+
+        message = '{} signs have been imported.'.format(imported)
+        if problems:
+            message += '\n\n{} rows were left out:\n'.format(len({row for row, _, _ in problems}))
+            message += '\n'.join('row {}: {} {}'.format(row, column, value) for row, column, value in problems[:20])
+        QMessageBox.information(self, 'Handshape Transcriptions Imported', message)
+
+    def on_export_progress(self, exported, total):
+        self.status_bar.showMessage('Exporting handshape transcriptions: {}/{}'.format(exported, total))
+
+    def on_export_finished(self, exported):
+        self.status_bar.clearMessage()
+        QMessageBox.information(self, 'Handshape Transcriptions Exported',
+                                'Handshape transcriptions have been successfully exported!')
+
+    def on_export_failed(self, message):
+        self.status_bar.clearMessage()
+        QMessageBox.critical(self, 'Export Failed', 'Handshape transcriptions could not be exported: ' + message)
 
     def show_hide_subwindows(self):
         self.sub_parameter.setHidden(not self.app_settings['display']['sub_parameter_show'])
@@ -664,6 +654,8 @@ class MainWindow(QMainWindow):
                                                                              os.path.join(
                                                                                  os.path.expanduser('~/Documents'),
                                                                                  'PCT', 'SLP-AA', 'IMAGE')))
+        self.app_settings['storage']['compression'] = self.app_qsettings.value('compression',
+                                                                               defaultValue=DEFAULT_CODEC)
         self.app_qsettings.endGroup()
 
         self.app_qsettings.beginGroup('display')
@@ -718,6 +710,7 @@ class MainWindow(QMainWindow):
         self.app_qsettings.setValue('recent_folder', self.app_settings['storage']['recent_folder'])
         self.app_qsettings.setValue('corpora', self.app_settings['storage']['corpora'])
         self.app_qsettings.setValue('image', self.app_settings['storage']['image'])
+        self.app_qsettings.setValue('compression', self.app_settings['storage']['compression'])
         self.app_qsettings.endGroup()
 
         self.app_qsettings.beginGroup('display')
@@ -769,8 +762,7 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage(text)
 
     def update_hand_illustration(self, num):
-        hand_img = QPixmap(self.app_ctx.hand_illustrations['slot' + str(num)])
-        self.illustration_scroll.set_img(hand_img)
+        self.illustration_scroll.set_illustration('slot' + str(num))
 
     def on_action_edit_preference(self):
         pref_dialog = PreferenceDialog(self.app_settings, parent=self)
@@ -808,12 +800,54 @@ class MainWindow(QMainWindow):
             self.undostack.clear()
 
     def save_corpus_binary(self):
-        with open(self.corpus.path, 'wb') as f:
-            pickle.dump(self.corpus, f, protocol=pickle.HIGHEST_PROTOCOL)
+        if is_sqlite_corpus_path(self.corpus.path):
+            # rows are written as signs are added/removed; saving only commits them
+            if not isinstance(self.corpus, SqliteCorpus):
+                self.corpus = SqliteCorpus.from_corpus(self.corpus, self.corpus.path)
+            self.corpus.commit()
+            return
+
+        # only the signs changed since the last save are appended to the journal, on the autosaver's thread;
+        # saves coming in quick succession are written together
+        if self.corpus_journal is None or self.corpus_journal.path != self.corpus.path:
+            self.corpus_journal = CorpusJournal(self.corpus.path)
+        # a change of compression has the next save rewrite the file
+        self.corpus_journal.codec = self.app_settings['storage']['compression']
+        if self.autosaver is None or self.autosaver.journal is not self.corpus_journal \
+                or self.autosaver.corpus is not self.corpus:
+            self.stop_autosaver()
+            self.autosaver = CorpusAutosaver(self.corpus_journal, self.corpus,
+                                             on_saved=self.autosave_notifier.saved.emit,
+                                             on_error=lambda error: self.autosave_notifier.failed.emit(str(error)))
+        self.autosaver.request_save()
+
+    def stop_autosaver(self):
+        # whatever is still queued is written before the autosaver goes
+        if self.autosaver is not None:
+            if not self.autosaver.stop():
+                QMessageBox.critical(self, 'Corpus Not Saved',
+                                     'The latest changes could not be written to ' + self.autosaver.journal.path)
+            self.autosaver = None
+
+    def on_autosave_saved(self):
+        self.status_bar.showMessage('Corpus saved', 2000)
+
+    def on_autosave_failed(self, message):
+        QMessageBox.critical(self, 'Corpus Not Saved', 'The corpus could not be saved: ' + message)
 
     def load_corpus_binary(self, path):
-        with open(path, 'rb') as f:
-            return pickle.load(f)
+        if is_sqlite_corpus_path(path):
+            self.corpus_journal = None
+            return SqliteCorpus(path)
+
+        # signs are only unpickled when they are selected
+        self.corpus_journal = CorpusJournal(path)
+        # only opening a corpus to edit it finishes a compaction a crash interrupted; loading never writes
+        self.corpus_journal.recover()
+        corpus = self.corpus_journal.load(lazy=True)
+        if self.corpus_journal.recovery_notes:
+            QMessageBox.warning(self, 'Corpus Recovered', '\n'.join(self.corpus_journal.recovery_notes))
+        return corpus
 
     def on_action_copy(self, clicked):
         pass
@@ -827,7 +861,9 @@ class MainWindow(QMainWindow):
         self.current_sign = None
         self.action_delete_sign.setEnabled(False)
 
+        self.close_corpus()
         self.corpus = Corpus(signs=None, location_definition=deepcopy(SAMPLE_LOCATIONS))
+        self.corpus_journal = None
 
         self.corpus_view.clear()
         self.lexical_scroll.clear(self.app_settings['metadata']['coder'])
@@ -836,20 +872,27 @@ class MainWindow(QMainWindow):
 
     def on_action_load_corpus(self, clicked):
         file_name, file_type = QFileDialog.getOpenFileName(self, self.tr('Open Corpus'), self.app_settings['storage']['recent_folder'],
-                                                           self.tr('SLAP-AA Corpus (*.slpaa)'))
+                                                           self.tr('SLAP-AA Corpus (*.slpaa);;SLAP-AA Database (*.slpaadb)'))
         folder, _ = os.path.split(file_name)
         if folder:
             self.app_settings['storage']['recent_folder'] = folder
 
+        self.close_corpus()
         self.corpus = self.load_corpus_binary(file_name)
 
-        first = self.corpus.get_sign_glosses()[0]
+        glosses = self.corpus.get_sign_glosses()
+        first = glosses[0]
         self.parameter_scroll.clear(self.corpus.location_definition, self.app_ctx)
-        self.corpus_view.updated_glosses(self.corpus.get_sign_glosses(), self.corpus.get_sign_by_gloss(first).lexical_information.gloss)
-        self.corpus_view.selected_gloss.emit(self.corpus.get_sign_by_gloss(first).lexical_information.gloss)
+        self.corpus_view.updated_glosses(glosses, first)
+        self.corpus_view.selected_gloss.emit(first)
 
         return bool(self.corpus)
 
+    def close_corpus(self):
+        self.stop_autosaver()
+        if self.corpus is not None:
+            self.corpus.close()
+
     def on_action_close(self, clicked):
         self.close()
 
@@ -915,5 +958,6 @@ class MainWindow(QMainWindow):
 
     @check_unsaved_change
     def closeEvent(self, event):
+        self.close_corpus()
         self.save_app_settings()
         super().closeEvent(event)
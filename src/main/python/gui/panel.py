@@ -45,7 +45,8 @@ from PyQt5.QtGui import (
     QPolygonF
 )
 
-from gui.hand_configuration import ConfigGlobal, Config
+from gui.hand_configuration import ConfigGlobal, Config, SLOT_STYLESHEET, PREDEFINED_IMAGE_SIZE
+from gui.image_cache import IMAGE_CACHE
 from gui.helper_widget import CollapsibleSection, ToggleSwitch
 from gui.decorator import check_date_format, check_empty_gloss
 from constant import DEFAULT_LOCATION_POINTS
@@ -363,6 +364,10 @@ class HandTranscriptionPanel(QScrollArea):
         super().__init__(**kwargs)
 
         self.setFrameStyle(QFrame.StyledPanel)
+        # the style of all 132 ConfigSlots below
+        self.setStyleSheet(SLOT_STYLESHEET)
+        # the images shown next to each hand for the predefined handshape its transcription matches
+        IMAGE_CACHE.prefetch(predefined_ctx.values(), PREDEFINED_IMAGE_SIZE)
         main_frame = QFrame(parent=self)
 
         main_layout = QGridLayout()
@@ -468,20 +473,19 @@ class HandIllustrationPanel(QScrollArea):
 
         self.hand_illustration = QLabel()
         self.hand_illustration.setFixedSize(QSize(400, 400))
+        # every illustration is scaled ahead of time, so moving across slots only swaps cached pixmaps
+        IMAGE_CACHE.prefetch(self.app_ctx.hand_illustrations.values(), self.hand_illustration.size())
         self.set_neutral_img()
         main_layout.addWidget(self.hand_illustration)
 
         self.setWidget(main_frame)
 
     def set_neutral_img(self):
-        neutral_img = QPixmap(self.app_ctx.hand_illustrations['neutral'])
-        self.hand_illustration.setPixmap(
-            neutral_img.scaled(self.hand_illustration.width(), self.hand_illustration.height(), Qt.KeepAspectRatio))
-        self.hand_illustration.repaint()
+        self.set_illustration('neutral')
 
-    def set_img(self, new_img):
+    def set_illustration(self, name):
         self.hand_illustration.setPixmap(
-            new_img.scaled(self.hand_illustration.width(), self.hand_illustration.height(), Qt.KeepAspectRatio))
+            IMAGE_CACHE.get_pixmap(self.app_ctx.hand_illustrations[name], self.hand_illustration.size()))
         self.hand_illustration.repaint()
 
 
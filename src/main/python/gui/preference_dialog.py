@@ -7,6 +7,7 @@ from PyQt5.QtWidgets import (
     QTabWidget,
     QSpinBox,
     QCheckBox,
+    QComboBox,
     QMessageBox,
     QDialogButtonBox,
     QLineEdit,
@@ -14,6 +15,8 @@ from PyQt5.QtWidgets import (
 )
 #from PyQt5.QtGui import ()
 
+from lexicon.corpus_io import CODECS
+
 
 class DisplayTab(QWidget):
     def __init__(self, settings, **kwargs):
@@ -43,6 +46,23 @@ class DisplayTab(QWidget):
         self.settings['metadata']['coder'] = str(self.coder_name.text())
 
 
+class StorageTab(QWidget):
+    def __init__(self, settings, **kwargs):
+        super().__init__(**kwargs)
+        self.settings = settings
+
+        main_layout = QFormLayout()
+        self.setLayout(main_layout)
+
+        self.compression = QComboBox(parent=self)
+        self.compression.addItems(list(CODECS))
+        self.compression.setCurrentText(settings['storage']['compression'])
+        main_layout.addRow(QLabel('Compression of saved corpora:'), self.compression)
+
+    def save_settings(self):
+        self.settings['storage']['compression'] = self.compression.currentText()
+
+
 class ReminderTab(QWidget):
     def __init__(self, settings, **kwargs):
         super().__init__(**kwargs)
@@ -77,6 +97,9 @@ class PreferenceDialog(QDialog):
         self.reminder_tab = ReminderTab(settings, parent=self)
         tabs.addTab(self.reminder_tab, 'Reminder')
 
+        self.storage_tab = StorageTab(settings, parent=self)
+        tabs.addTab(self.storage_tab, 'Storage')
+
         buttons = QDialogButtonBox.Save | QDialogButtonBox.Cancel
         self.button_box = QDialogButtonBox(buttons, parent=self)
         main_layout.addWidget(self.button_box)
@@ -91,6 +114,7 @@ class PreferenceDialog(QDialog):
         elif standard == QDialogButtonBox.Save:
             self.display_tab.save_settings()
             self.reminder_tab.save_settings()
+            self.storage_tab.save_settings()
 
             QMessageBox.information(self, 'Preferences Saved', 'New preferences saved!')
             self.accept()
@@ -0,0 +1,111 @@
+import threading
+import time
+
+# seconds without a new save request before the pending saves are written
+AUTOSAVE_DELAY = 1.0
+
+
+class CorpusAutosaver:
+    """
+    Write the saves of a CorpusJournal on a background thread.
+    request_save() takes the changes out of the corpus on the calling thread (cheap: references only) and returns at
+    once; the worker waits until no request has come in for `delay` seconds and writes everything queued as one save.
+    on_saved() and on_error(error) are called on the worker thread.
+    """
+    def __init__(self, journal, corpus, delay=AUTOSAVE_DELAY, on_saved=None, on_error=None):
+        self.journal = journal
+        self.corpus = corpus
+        self.delay = delay
+        self.on_saved = on_saved
+        self.on_error = on_error
+
+        self.condition = threading.Condition()
+        # CorpusChanges not written yet, and when the last one came in
+        self.queued = None
+        self.requested_at = 0
+        self.writing = False
+        # the last write failed; the worker waits for the next request or flush() before trying again
+        self.failed = False
+        self.stopping = False
+
+        self.thread = threading.Thread(target=self.run, name='CorpusAutosaver', daemon=True)
+        self.thread.start()
+
+    def request_save(self):
+        changes = self.journal.take_changes(self.corpus)
+        with self.condition:
+            if self.queued is None:
+                self.queued = changes
+            else:
+                self.queued.merge(changes)
+            self.requested_at = time.monotonic()
+            self.failed = False
+            self.condition.notify_all()
+
+    def has_unsaved_changes(self):
+        with self.condition:
+            return self.queued is not None or self.writing
+
+    def flush(self, timeout=None):
+        """
+        Write whatever is queued without waiting for the delay, and wait for it to be on disk;
+        return False if it is still not written after timeout seconds or if the write failed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            self.requested_at = 0
+            self.failed = False
+            self.condition.notify_all()
+            while self.queued is not None or self.writing:
+                if self.failed and not self.writing:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            return True
+
+    def stop(self, timeout=None):
+        saved = self.flush(timeout)
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+        return saved
+
+    def run(self):
+        while True:
+            with self.condition:
+                # wait for a request, then for `delay` seconds without a new one
+                while not self.stopping:
+                    if self.queued is not None and not self.failed:
+                        remaining = self.requested_at + self.delay - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self.condition.wait(remaining)
+                    else:
+                        self.condition.wait()
+                if self.stopping:
+                    return
+                changes, self.queued = self.queued, None
+                self.writing = True
+
+            try:
+                self.journal.write(self.corpus, changes)
+            except (OSError, ValueError) as error:
+                with self.condition:
+                    # keep the changes for the next attempt, which the next request triggers
+                    if self.queued is not None:
+                        changes.merge(self.queued)
+                    self.queued = changes
+                    self.failed = True
+                    self.writing = False
+                    self.condition.notify_all()
+                if self.on_error is not None:
+                    self.on_error(error)
+            else:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()
+                if self.on_saved is not None:
+                    self.on_saved()
@@ -0,0 +1,93 @@
+import numpy as np
+
+from lexicon.lexicon_classes import SYMBOLS, SYMBOL_CODES, OVERFLOW_CODE, SLOT_INDEX, SLOTS_PER_HAND
+
+# hands in the order they are packed in HandshapeTranscription.codes
+HANDS = ((1, 1), (1, 2), (2, 1), (2, 2))
+SLOTS_PER_SIGN = len(HANDS) * SLOTS_PER_HAND
+FLAG_BYTES = (SLOTS_PER_SIGN + 7) // 8
+
+
+def hand_index(config_number, hand_number):
+    return (config_number - 1) * 2 + hand_number - 1
+
+
+def unpack_flags(flags):
+    # one int bitset per sign -> (n_signs, 4, 33) bool matrix
+    packed = np.frombuffer(b''.join(flag.to_bytes(FLAG_BYTES, 'little') for flag in flags), dtype=np.uint8)
+    bits = np.unpackbits(packed.reshape(-1, FLAG_BYTES), axis=1, bitorder='little')[:, :SLOTS_PER_SIGN]
+    return bits.astype(bool).reshape(-1, len(HANDS), SLOTS_PER_HAND)
+
+
+class ColumnarCorpus:
+    """
+    Read-only snapshot of a corpus as NumPy arrays, one row per sign in gloss order.
+    codes[i, hand_index(config, hand), SLOT_INDEX[slot_number]] is the SYMBOL_CODES code of that slot;
+    symbols outside SYMBOLS are stored as OVERFLOW_CODE and kept in self.overflow.
+    The snapshot is not updated when the corpus changes; call Corpus.to_columnar() again.
+    """
+    def __init__(self, signs):
+        signs = list(signs)
+        transcriptions = [sign.handshape_transcription for sign in signs]
+        n_signs = len(signs)
+
+        self.glosses = np.array([sign.lexical_information.gloss for sign in signs], dtype=object)
+
+        self.codes = np.frombuffer(b''.join(bytes(transcription.codes) for transcription in transcriptions),
+                                   dtype=np.uint8).reshape(n_signs, len(HANDS), SLOTS_PER_HAND)
+        self.estimate = unpack_flags([transcription.estimate_flags for transcription in transcriptions])
+        self.uncertain = unpack_flags([transcription.uncertain_flags for transcription in transcriptions])
+
+        # (row, position in the transcription) -> symbol, for the slots coded as OVERFLOW_CODE
+        self.overflow = {(row, position): symbol
+                         for row, transcription in enumerate(transcriptions) if transcription.overflow
+                         for position, symbol in transcription.overflow.items()}
+
+        self.handedness = np.array([transcription.handedness for transcription in transcriptions], dtype=np.uint8)
+        self.config = np.array([transcription.config for transcription in transcriptions], dtype=np.uint8)
+
+        lexical_infos = [sign.lexical_information for sign in signs]
+        self.frequency = np.array([info.frequency for info in lexical_infos], dtype=np.float64)
+        self.update_date = np.array([info.update_date for info in lexical_infos], dtype='datetime64[D]')
+        # coders as categorical codes into self.coders
+        self.coders, coder_codes = np.unique(np.array([info.coder for info in lexical_infos], dtype=object),
+                                             return_inverse=True)
+        self.coder = coder_codes.astype(np.int32)
+
+        self.forearm = np.array([sign.global_handshape_information.forearm for sign in signs], dtype=bool)
+
+    def __len__(self):
+        return len(self.glosses)
+
+    def __repr__(self):
+        return '<COLUMNAR CORPUS: ' + repr(len(self)) + ' signs>'
+
+    def get_slot_codes(self, config_number, hand_number, slot_number):
+        return self.codes[:, hand_index(config_number, hand_number), SLOT_INDEX[slot_number]]
+
+    def get_symbol(self, row, config_number, hand_number, slot_number):
+        hand = hand_index(config_number, hand_number)
+        code = self.codes[row, hand, SLOT_INDEX[slot_number]]
+        if code == OVERFLOW_CODE:
+            return self.overflow[(row, hand * SLOTS_PER_HAND + SLOT_INDEX[slot_number])]
+        return SYMBOLS[code]
+
+    def slot_mask(self, config_number, hand_number, slot_number, symbol):
+        """
+        Boolean array over the signs whose slot holds symbol
+        """
+        slot_codes = self.get_slot_codes(config_number, hand_number, slot_number)
+        if symbol in SYMBOL_CODES:
+            return slot_codes == SYMBOL_CODES[symbol]
+
+        mask = np.zeros(len(self), dtype=bool)
+        position = hand_index(config_number, hand_number) * SLOTS_PER_HAND + SLOT_INDEX[slot_number]
+        for row in np.flatnonzero(slot_codes == OVERFLOW_CODE):
+            mask[row] = self.overflow[(row, position)] == symbol
+        return mask
+
+    def count_symbol(self, config_number, hand_number, slot_number, symbol):
+        return int(np.count_nonzero(self.slot_mask(config_number, hand_number, slot_number, symbol)))
+
+    def get_glosses(self, mask):
+        return self.glosses[mask].tolist()
@@ -0,0 +1,601 @@
+import bz2
+import io
+import lzma
+import os
+import pickle
+import struct
+import threading
+import zlib
+from bisect import bisect_left
+from functools import partial
+
+from lexicon.lexicon_classes import Corpus
+
+# .slpaa journaled format:
+#   MAGIC, TOC_POINTER (offset of the TOC record), CODEC_ID, then a sequence of records, each one being
+#   RECORD_HEADER (op, key length, payload length) + key (utf-8 gloss) + payload (pickle, compressed with the codec)
+# The file starts with a snapshot (one META record, one ADD record per sign, one TOC record mapping every gloss to
+# the position of its pickled sign and a COMMIT record); every save after that only appends the signs that changed
+# since the previous save: an INTENT record holding the length and CRC-32 of the records of the save, the records, and
+# a COMMIT record once they are on disk. Later records override earlier ones on load. Records with no COMMIT after them
+# (a save interrupted by a crash) are replayed if their INTENT shows they are all on disk intact, and left out if not.
+# The last byte of MAGIC is the version of the format; files of any other version are refused.
+MAGIC = b'SLPAA-J\x01'
+# what MAGIC starts with whatever the version
+MAGIC_PREFIX = MAGIC[:-1]
+TOC_POINTER = struct.Struct('<Q')
+CODEC_ID = struct.Struct('<B')
+RECORD_HEADER = struct.Struct('<cII')
+# payload of an INTENT record: length and CRC-32 of the records of the save that follow it
+BATCH_INTENT = struct.Struct('<II')
+
+META = b'M'
+ADD = b'A'
+DELETE = b'D'
+TOC = b'T'
+INTENT = b'I'
+COMMIT = b'C'
+
+# the journal is compacted into a fresh snapshot once it holds at least this many superseded records,
+# or as many superseded records as there are live signs, whichever is larger
+COMPACT_MIN_RECORDS = 500
+
+
+# codec name -> (id written in the header, compress, decompress); payloads are compressed one record at a time, so that
+# signs can still be read one by one and neither saving nor loading ever holds the whole file in memory
+# lzma: raw LZMA2 streams with a dictionary sized for one sign, since an .xz container per record costs more in its own
+# headers and dictionary setup than it saves
+LZMA_FILTERS = [{'id': lzma.FILTER_LZMA2, 'preset': 6, 'dict_size': 1 << 16}]
+CODECS = {
+    'none': (0, None, None),
+    'zlib': (1, zlib.compress, zlib.decompress),
+    'lzma': (2, partial(lzma.compress, format=lzma.FORMAT_RAW, filters=LZMA_FILTERS),
+             partial(lzma.decompress, format=lzma.FORMAT_RAW, filters=LZMA_FILTERS)),
+    'bz2': (3, bz2.compress, bz2.decompress),
+}
+CODEC_NAMES = {codec_id: codec for codec, (codec_id, _, _) in CODECS.items()}
+DEFAULT_CODEC = 'none'
+
+
+def compress(codec, payload):
+    function = CODECS[codec][1]
+    return payload if function is None else function(payload)
+
+
+def decompress(codec, payload):
+    function = CODECS[codec][2]
+    return payload if function is None else function(payload)
+
+
+def read_header_field(f, size):
+    field = f.read(size)
+    if len(field) < size:
+        raise ValueError('{} is truncated: its header is incomplete'.format(f.name))
+    return field
+
+
+def read_header(f):
+    """
+    Return (TOC offset, codec) read from the start of the open file f, or None if it is not journaled.
+    Raise ValueError if the header is cut short or in a version of the format this one does not know.
+    """
+    magic = f.read(len(MAGIC))
+    if not magic or not (magic.startswith(MAGIC_PREFIX) or MAGIC_PREFIX.startswith(magic)):
+        return None
+    if len(magic) < len(MAGIC):
+        raise ValueError('{} is truncated: its header is incomplete'.format(f.name))
+    if magic != MAGIC:
+        raise ValueError('{} was written in an unknown version ({}) of the corpus format'.format(f.name, magic[-1]))
+
+    toc_offset, = TOC_POINTER.unpack(read_header_field(f, TOC_POINTER.size))
+    codec_id, = CODEC_ID.unpack(read_header_field(f, CODEC_ID.size))
+    if codec_id not in CODEC_NAMES:
+        raise ValueError('Unknown compression codec {} in {}'.format(codec_id, f.name))
+    return toc_offset, CODEC_NAMES[codec_id]
+
+
+def write_header(f, toc_offset, codec):
+    f.write(MAGIC)
+    f.write(TOC_POINTER.pack(toc_offset))
+    f.write(CODEC_ID.pack(CODECS[codec][0]))
+
+
+def is_complete_snapshot(path):
+    """
+    Whether path holds a whole snapshot, i.e. its TOC pointer has been filled in and its TOC record is followed by the
+    COMMIT record, which is only written once everything before it is on disk
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = read_header(f)
+            if header is None or header[0] == 0:
+                return False
+            f.seek(header[0])
+            records = read_records(f)
+            toc = next(records, None)
+            if toc is None or toc[0] != TOC or not isinstance(pickle.loads(decompress(header[1], toc[2])), dict):
+                return False
+            commit = next(records, None)
+            return commit is not None and commit[0] == COMMIT
+    except (OSError, ValueError, struct.error, EOFError, pickle.UnpicklingError, zlib.error, lzma.LZMAError):
+        pass
+    return False
+
+
+def sync_file(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def sync_directory(path):
+    # a rename only survives a power loss once the directory holding the file is synced too; POSIX only
+    if hasattr(os, 'O_DIRECTORY'):
+        directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+def write_record(f, op, key=b'', payload=b''):
+    """
+    Return the offset of the payload in the file
+    """
+    f.write(RECORD_HEADER.pack(op, len(key), len(payload)))
+    f.write(key)
+    payload_offset = f.tell()
+    f.write(payload)
+    return payload_offset
+
+
+def read_records(f, read_payload=True):
+    """
+    Yield (op, key, payload, payload_offset, payload_length, end_offset) for every complete record;
+    a truncated trailing record is ignored.
+    With read_payload=False, the payloads of ADD records are skipped over and yielded as None.
+    """
+    file_size = os.fstat(f.fileno()).st_size
+    while True:
+        header = f.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return
+        op, key_length, payload_length = RECORD_HEADER.unpack(header)
+        key = f.read(key_length)
+        payload_offset = f.tell()
+        if len(key) < key_length or payload_offset + payload_length > file_size:
+            return
+
+        if read_payload or op != ADD:
+            payload = f.read(payload_length)
+        else:
+            payload = None
+            f.seek(payload_length, os.SEEK_CUR)
+        yield op, key, payload, payload_offset, payload_length, f.tell()
+
+
+def find_batch_end(f, intent):
+    """
+    Return the offset right after the records announced by the INTENT record if they are all on disk intact, else None
+    """
+    _, _, payload, _, _, batch_offset = intent
+    if len(payload) != BATCH_INTENT.size:
+        return None
+    length, checksum = BATCH_INTENT.unpack(payload)
+    f.seek(batch_offset)
+    batch = f.read(length)
+    if len(batch) < length or zlib.crc32(batch) != checksum:
+        return None
+    return batch_offset + length
+
+
+def split_intact_batches(f, staged):
+    """
+    Split the records read after the last COMMIT into those of the saves that were written whole before a crash kept
+    their COMMIT from being written, and the rest
+    """
+    intact = 0
+    while intact < len(staged) and staged[intact][0] == INTENT:
+        batch_end = find_batch_end(f, staged[intact])
+        if batch_end is None:
+            break
+        intact += 1
+        while intact < len(staged) and staged[intact][5] <= batch_end:
+            intact += 1
+    return staged[:intact], staged[intact:]
+
+
+def read_payload(path, offset, length):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return f.read(length)
+
+
+def dump_sign(sign):
+    return pickle.dumps(sign, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def dump_meta(corpus):
+    return pickle.dumps({'name': corpus.name, 'location_definition': corpus.location_definition},
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class LazyCorpus(Corpus):
+    """
+    Corpus loaded from a table of contents only; a sign is unpickled from the .slpaa file the first time it is
+    asked for. Signs may be looked up from a worker thread (e.g. a CSV export) while the GUI thread keeps editing
+    the corpus.
+    """
+    def __init__(self, path, table_of_contents, codec=DEFAULT_CODEC, **kwargs):
+        super().__init__(path=path, **kwargs)
+        self.source_path = path
+        self.codec = codec
+        # held while a sign is moved from unloaded into the corpus, while a sign is added or removed and while
+        # source_path is swapped for a compacted file
+        self.file_lock = threading.RLock()
+
+        # gloss -> (offset, length) of the pickled sign in source_path, for the signs not unpickled yet
+        self.unloaded = table_of_contents
+        self.sorted_glosses = sorted(table_of_contents)
+
+    def materialize(self, gloss):
+        """
+        Return the sign of gloss, unpickling it if it is still in the file; another thread may have done so first, or
+        replaced or removed the sign meanwhile
+        """
+        with self.file_lock:
+            location = self.unloaded.get(gloss)
+            if location is None:
+                return super().get_sign_by_gloss(gloss)
+            sign = pickle.loads(decompress(self.codec, read_payload(self.source_path, *location)))
+            self.signs.add(sign)
+            # indexed before it leaves unloaded, so that a lookup without the lock always finds it in one of them
+            self.gloss_index[gloss] = sign
+            del self.unloaded[gloss]
+            return sign
+
+    def materialize_all(self):
+        for gloss in list(self.unloaded):
+            self.materialize(gloss)
+
+    def relocate(self, source_path, table_of_contents, codec):
+        self.source_path = source_path
+        self.codec = codec
+        self.unloaded = {gloss: table_of_contents[gloss] for gloss in self.unloaded}
+
+    def get_sign_by_gloss(self, gloss):
+        if gloss in self.unloaded:
+            return self.materialize(gloss)
+        return super().get_sign_by_gloss(gloss)
+
+    def has_gloss(self, gloss):
+        return gloss in self.unloaded or super().has_gloss(gloss)
+
+    def add_sign(self, new_sign):
+        gloss = new_sign.lexical_information.gloss
+        with self.file_lock:
+            if self.unloaded.pop(gloss, None) is not None:
+                del self.sorted_glosses[bisect_left(self.sorted_glosses, gloss)]
+            super().add_sign(new_sign)
+
+    def remove_sign(self, trash_sign):
+        gloss = trash_sign.lexical_information.gloss
+        with self.file_lock:
+            if gloss in self.unloaded:
+                self.materialize(gloss)
+            super().remove_sign(trash_sign)
+
+    def __iter__(self):
+        self.materialize_all()
+        return super().__iter__()
+
+    def __len__(self):
+        return len(self.sorted_glosses)
+
+    def __getstate__(self):
+        self.materialize_all()
+        state = super().__getstate__()
+        del state['file_lock']
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.file_lock = threading.RLock()
+
+
+class CorpusJournal:
+    """
+    Append-only store for a single .slpaa file.
+    Saving a corpus appends only Corpus.pending_changes, so the cost of a save does not depend on the corpus size.
+    codec is the compression of the file (one of CODECS); with None, a loaded file keeps its own and a new one gets
+    DEFAULT_CODEC. Changing it has the next save rewrite the file.
+    """
+    def __init__(self, path, codec=None):
+        self.path = path
+        self.codec = codec
+        # compression of the file as it is on disk, None until it has been loaded or written
+        self.file_codec = None
+
+        # offset right after the last committed record, i.e. where the next record goes
+        self.end_offset = None
+        # number of records in the file, live or superseded
+        self.record_count = 0
+        self.meta_payload = None
+        # what recover() and load() found of an interrupted save, as messages for the user
+        self.recovery_notes = list()
+
+    def recover(self):
+        """
+        Finish the saves a crash interrupted: a compaction between writing the new snapshot and renaming it over the
+        file, and appended records that are all on disk but have no COMMIT after them.
+        Only to be called by whoever opens the file to edit it: unlike load(), it changes the files on disk.
+        A complete snapshot is never older than the file: nothing is appended before the rename.
+        A snapshot without its COMMIT record is left alone, as another process may still be writing it; if it was cut
+        short by a crash instead, the next compaction writes over it.
+        """
+        temp_path = self.path + '.tmp'
+        if os.path.exists(temp_path) and is_complete_snapshot(temp_path):
+            os.replace(temp_path, self.path)
+            sync_directory(self.path)
+            self.recovery_notes.append('An interrupted compaction of the corpus file was completed.')
+
+        with open(self.path, 'r+b') as f:
+            header = read_header(f)
+            if header is None or header[0] == 0:
+                return
+            f.seek(header[0])
+            staged = list()
+            for record in read_records(f, read_payload=False):
+                staged.append(record)
+                if record[0] in (COMMIT, TOC):
+                    staged = list()
+            replayed, _ = split_intact_batches(f, staged)
+            if replayed:
+                # whatever follows the intact records is cut off, as the next save would
+                f.seek(replayed[-1][5])
+                f.truncate()
+                write_record(f, COMMIT)
+                sync_file(f)
+                self.recovery_notes.append('The last save before the corpus was closed was interrupted after its '
+                                           '{} change(s) were written; it was completed.'.format(len(replayed)))
+
+    def load(self, lazy=False):
+        """
+        With lazy=True, only the table of contents and the journal appended after it are read, and a LazyCorpus is
+        returned; otherwise every sign is unpickled up front.
+        Nothing is written: an interrupted save is replayed if all of it is on disk, and otherwise left out of the
+        corpus and cut off by the next save.
+        """
+        # gloss -> pickled sign, or (offset, length) of the pickled sign when loading lazily
+        signs = dict()
+        # records read since the last COMMIT (or the TOC, which ends the snapshot), applied once committed
+        staged = list()
+        with open(self.path, 'rb') as f:
+            header = read_header(f)
+            if header is None:
+                # whole-corpus pickle written by earlier versions; the first save rewrites it as a snapshot
+                f.seek(0)
+                corpus = pickle.load(f)
+                corpus.path = self.path
+                corpus.clear_pending_changes()
+                return corpus
+
+            toc_offset, codec = header
+            self.end_offset = f.tell()
+            meta_payload = None
+
+            records = read_records(f, read_payload=not lazy)
+            if lazy:
+                # the snapshot starts with the META record; the signs that follow it are skipped through the TOC
+                record = next(records, None)
+                if record is None or record[0] != META:
+                    raise ValueError('{} has no corpus metadata'.format(self.path))
+                meta_payload = record[2]
+                f.seek(toc_offset)
+                records = read_records(f, read_payload=False)
+                record = next(records, None)
+                if toc_offset == 0 or record is None or record[0] != TOC:
+                    raise ValueError('{} has no table of contents'.format(self.path))
+                _, _, payload, _, _, self.end_offset = record
+                signs = pickle.loads(decompress(codec, payload))
+                self.record_count = len(signs) + 2
+
+            def apply(committed):
+                nonlocal meta_payload
+                for op, key, payload, payload_offset, payload_length, end_offset in committed:
+                    if op == META:
+                        meta_payload = payload
+                    elif op == ADD:
+                        signs[key.decode('utf-8')] = (payload_offset, payload_length) if lazy else payload
+                    elif op == DELETE:
+                        signs.pop(key.decode('utf-8'), None)
+                    self.end_offset = end_offset
+                    self.record_count += 1
+
+            for record in records:
+                staged.append(record)
+                if record[0] in (COMMIT, TOC):
+                    apply(staged)
+                    staged = list()
+            replayed, staged = split_intact_batches(f, staged)
+            apply(replayed)
+            if meta_payload is None:
+                raise ValueError('{} has no corpus metadata'.format(self.path))
+            self.meta_payload = decompress(codec, meta_payload)
+            self.file_codec = codec
+
+        if replayed:
+            # committed by recover(); until then, the next save appends after them
+            self.recovery_notes.append('The last save before the corpus was closed was interrupted after its '
+                                       '{} change(s) were written; they were replayed.'.format(len(replayed)))
+        if staged:
+            # cut off when the next save truncates the file at end_offset
+            self.recovery_notes.append('The last save before the corpus was closed was interrupted; '
+                                       '{} change(s) it was writing were lost.'.format(len(staged)))
+        meta = pickle.loads(self.meta_payload)
+        if lazy:
+            return LazyCorpus(self.path, signs, codec=codec, name=meta['name'],
+                              location_definition=meta['location_definition'])
+
+        corpus = Corpus(name=meta['name'], location_definition=meta['location_definition'], path=self.path)
+        for payload in signs.values():
+            corpus.add_sign(pickle.loads(decompress(codec, payload)))
+        corpus.clear_pending_changes()
+
+        return corpus
+
+    def needs_compaction(self, corpus):
+        # all but the META, TOC and COMMIT records of the snapshot and one ADD record per sign has been superseded
+        superseded = self.record_count - len(corpus) - 3
+        return superseded >= max(COMPACT_MIN_RECORDS, len(corpus))
+
+    def save(self, corpus):
+        self.write(corpus, self.take_changes(corpus))
+
+    def compact(self, corpus):
+        self.write(corpus, self.take_changes(corpus, compact=True))
+
+    def take_changes(self, corpus, compact=False):
+        """
+        Take what the next save has to write out of corpus, so that write() can run on another thread while the
+        corpus keeps being edited; this only copies references and is cheap enough for the GUI thread.
+        """
+        changes = CorpusChanges(dump_meta(corpus), dict(corpus.pending_changes))
+        if compact or self.end_offset is None or self.codec not in (None, self.file_codec) \
+                or self.needs_compaction(corpus):
+            # gloss -> Sign, or None for a sign still in the file of a LazyCorpus, read when the snapshot is written
+            changes.signs = dict(corpus.gloss_index)
+            if isinstance(corpus, LazyCorpus):
+                changes.signs.update(dict.fromkeys(corpus.unloaded))
+            changes.pending = dict()
+        corpus.clear_pending_changes()
+        return changes
+
+    def write(self, corpus, changes):
+        if changes.signs is not None:
+            self.write_snapshot(corpus, changes)
+
+        if changes.pending or changes.meta_payload != self.meta_payload:
+            self.append(changes)
+
+    def append(self, changes):
+        with open(self.path, 'r+b') as f:
+            # drop whatever an interrupted save may have left after the last complete record
+            f.seek(self.end_offset)
+            f.truncate()
+
+            # the records are put together first, so that the INTENT record before them can describe them
+            batch = io.BytesIO()
+            record_count = self.record_count + 1
+            if changes.meta_payload != self.meta_payload:
+                write_record(batch, META, payload=compress(self.file_codec, changes.meta_payload))
+                record_count += 1
+
+            for gloss, sign in changes.pending.items():
+                if sign is None:
+                    write_record(batch, DELETE, gloss.encode('utf-8'))
+                else:
+                    write_record(batch, ADD, gloss.encode('utf-8'), compress(self.file_codec, dump_sign(sign)))
+                record_count += 1
+
+            batch = batch.getvalue()
+            write_record(f, INTENT, payload=BATCH_INTENT.pack(len(batch), zlib.crc32(batch)))
+            f.write(batch)
+            # the changes count once the COMMIT record after them is on disk, and it may only get there after them;
+            # if it never does, the INTENT record tells whether they can be replayed
+            sync_file(f)
+            write_record(f, COMMIT)
+            sync_file(f)
+            record_count += 1
+            end_offset = f.tell()
+
+        self.meta_payload = changes.meta_payload
+        self.record_count = record_count
+        self.end_offset = end_offset
+
+    def write_snapshot(self, corpus, changes):
+        """
+        Rewrite the file as a fresh snapshot: written next to the current file, synced to disk and then renamed over
+        it, so that the current file stays whole until the snapshot is complete.
+        A LazyCorpus still reads its signs from the current file meanwhile, so it is relocated under its file_lock.
+        """
+        temp_path = self.path + '.tmp'
+        codec = self.codec or self.file_codec or DEFAULT_CODEC
+        table_of_contents = dict()
+        with open(temp_path, 'wb') as f:
+            write_header(f, 0, codec)
+
+            write_record(f, META, payload=compress(codec, changes.meta_payload))
+            for gloss in sorted(changes.signs):
+                payload = get_sign_payload(corpus, gloss, changes.signs[gloss], codec)
+                if payload is not None:
+                    table_of_contents[gloss] = (write_record(f, ADD, gloss.encode('utf-8'), payload), len(payload))
+
+            toc_offset = f.tell()
+            write_record(f, TOC, payload=compress(codec, pickle.dumps(table_of_contents,
+                                                                      protocol=pickle.HIGHEST_PROTOCOL)))
+            commit_offset = f.tell()
+            f.seek(0)
+            write_header(f, toc_offset, codec)
+
+            # as with an append, the COMMIT record marks the snapshot complete (see recover()) only once the rest of it
+            # is on disk
+            sync_file(f)
+            f.seek(commit_offset)
+            write_record(f, COMMIT)
+            sync_file(f)
+            end_offset = f.tell()
+
+        if isinstance(corpus, LazyCorpus):
+            with corpus.file_lock:
+                os.replace(temp_path, self.path)
+                corpus.relocate(self.path, table_of_contents, codec)
+        else:
+            os.replace(temp_path, self.path)
+        sync_directory(self.path)
+        self.file_codec = codec
+
+        self.meta_payload = changes.meta_payload
+        self.record_count = len(table_of_contents) + 3
+        self.end_offset = end_offset
+
+
+class CorpusChanges:
+    """
+    What one save writes: the META payload, the pending changes (gloss: Sign, or None for a removal)
+    and, when the file is to be compacted, every sign of the corpus
+    """
+    def __init__(self, meta_payload, pending, signs=None):
+        self.meta_payload = meta_payload
+        self.pending = pending
+        self.signs = signs
+
+    def merge(self, newer):
+        """
+        Fold a later save into this one, so that several saves are written at once
+        """
+        self.meta_payload = newer.meta_payload
+        if newer.signs is not None:
+            self.signs = newer.signs
+            self.pending = newer.pending
+        else:
+            self.pending.update(newer.pending)
+
+
+def get_sign_payload(corpus, gloss, sign, codec):
+    """
+    Return the sign as written in a file compressed with codec
+    """
+    if sign is not None:
+        return compress(codec, dump_sign(sign))
+
+    # a sign of a LazyCorpus that was still in its file when the changes were taken; if it has been unpickled since,
+    # the in-memory sign is written instead, and any later edit to it is in the next save anyway
+    with corpus.file_lock:
+        location = corpus.unloaded.get(gloss)
+        if location is not None:
+            payload = read_payload(corpus.source_path, *location)
+            if corpus.codec == codec:
+                return payload
+            return compress(codec, decompress(corpus.codec, payload))
+    sign = corpus.gloss_index.get(gloss)
+    return compress(codec, dump_sign(sign)) if sign is not None else None
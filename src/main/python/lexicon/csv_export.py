@@ -0,0 +1,88 @@
+import csv
+
+from lexicon.lexicon_classes import HAND_SLOTS, SLOTS_PER_HAND
+
+# 'individual': one column per slot; 'single': one column per hand, with the slots joined into a string
+EXPORT_OPTIONS = ('individual', 'single')
+
+SIGN_HEADER = ['GLOSS', 'FREQUENCY', 'CODER', 'LAST_UPDATED', 'NOTES', 'FOREARM', 'ESTIMATED', 'UNCERTAIN',
+               'INCOMPLETE', 'FINGERSPELLED', 'INITIALIZED']
+# in the order the hands are packed in HandshapeTranscription.codes
+HAND_NAMES = ['C1H1', 'C1H2', 'C2H1', 'C2H2']
+TRANSCRIPTION_LENGTH = len(HAND_NAMES) * SLOTS_PER_HAND
+
+# file buffer of the exporter, so that rows reach the disk in large writes
+BUFFER_SIZE = 1 << 20
+# how many rows go by between two progress reports
+PROGRESS_INTERVAL = 500
+
+
+def get_header(option):
+    if option == 'individual':
+        return SIGN_HEADER + [hand + '_S' + str(slot_number) for hand in HAND_NAMES for slot_number in HAND_SLOTS]
+    elif option == 'single':
+        return SIGN_HEADER + HAND_NAMES
+    raise ValueError('Unknown export option: ' + repr(option))
+
+
+def get_sign_info(sign):
+    lexical_info = sign.lexical_information
+    global_info = sign.global_handshape_information
+    return [lexical_info.gloss, lexical_info.frequency, lexical_info.coder, str(lexical_info.update_date),
+            lexical_info.note, global_info.forearm, global_info.estimated, global_info.uncertain,
+            global_info.incomplete, global_info.fingerspelled, global_info.initialized]
+
+
+def iter_signs(corpus):
+    """
+    Yield the signs of corpus in gloss order, looking them up one at a time.
+    The glosses are copied first, so that the corpus can change while a worker thread is still exporting.
+    """
+    for gloss in list(corpus.get_sign_glosses()):
+        sign = corpus.get_sign_by_gloss(gloss)
+        if sign is not None:
+            yield sign
+
+
+def iter_rows(signs, option):
+    """
+    Yield the CSV rows of signs, header first, one row at a time
+    """
+    yield get_header(option)
+
+    if option == 'individual':
+        for sign in signs:
+            # all four hands in a single pass over the packed transcription
+            yield get_sign_info(sign) + sign.handshape_transcription.get_symbols(0, TRANSCRIPTION_LENGTH)
+    else:
+        for sign in signs:
+            symbols = sign.handshape_transcription.get_symbols(0, TRANSCRIPTION_LENGTH)
+            yield get_sign_info(sign) + [''.join(symbols[start:start + SLOTS_PER_HAND])
+                                         for start in range(0, TRANSCRIPTION_LENGTH, SLOTS_PER_HAND)]
+
+
+def write_rows(rows, file_name):
+    with open(file_name, 'w', newline='', buffering=BUFFER_SIZE) as f:
+        csv.writer(f, delimiter=',', quoting=csv.QUOTE_MINIMAL).writerows(rows)
+
+
+def export_csv(corpus, file_name, option, progress=None):
+    """
+    Stream the handshape transcriptions of corpus into file_name and return the number of signs exported.
+    progress, if given, is called as progress(exported, total) every PROGRESS_INTERVAL signs and at the end.
+    """
+    total = len(corpus)
+    exported = 0
+
+    def counted(signs):
+        nonlocal exported
+        for sign in signs:
+            yield sign
+            exported += 1
+            if progress is not None and exported % PROGRESS_INTERVAL == 0:
+                progress(exported, total)
+
+    write_rows(iter_rows(counted(iter_signs(corpus)), option), file_name)
+    if progress is not None:
+        progress(exported, total)
+    return exported
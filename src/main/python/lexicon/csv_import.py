@@ -0,0 +1,116 @@
+import csv
+from datetime import date
+from itertools import islice
+from operator import itemgetter
+
+from lexicon.csv_export import SIGN_HEADER, get_header
+from lexicon.lexicon_classes import Sign, HAND_SLOTS
+from lexicon.slot_options import ALLOWED_SYMBOLS
+
+# the 'individual' layout written by lexicon.csv_export: C1H1_S2 ... C2H2_S34
+SLOT_HEADER = get_header('individual')[len(SIGN_HEADER):]
+# allowed symbols of every slot column, in the same order
+COLUMN_ALLOWED_SYMBOLS = [ALLOWED_SYMBOLS[slot_number] for _ in range(4) for slot_number in HAND_SLOTS]
+
+# rows read and validated together
+BATCH_SIZE = 1000
+
+
+def parse_bool(value):
+    if value not in ('True', 'False'):
+        raise ValueError('expected True or False')
+    return value == 'True'
+
+
+def get_column_indices(header):
+    missing = [column for column in SIGN_HEADER + SLOT_HEADER if column not in header]
+    if missing:
+        raise ValueError('Not a handshape transcription CSV in the individual layout; missing columns: ' +
+                         ', '.join(missing[:5]) + (' ...' if len(missing) > 5 else ''))
+    column_index = {column: index for index, column in enumerate(header)}
+    return [column_index[column] for column in SIGN_HEADER], [column_index[column] for column in SLOT_HEADER]
+
+
+def find_invalid_slots(rows, slot_indices):
+    """
+    Return {row index in batch: [(column, symbol), ...]} for the symbols not allowed in their slot.
+    Each slot column is checked for the whole batch with one set difference, and rows are only looked at one by one
+    for the columns that actually hold something invalid.
+    """
+    invalid = dict()
+    for column, index, allowed in zip(SLOT_HEADER, slot_indices, COLUMN_ALLOWED_SYMBOLS):
+        values = {row[index] for row in rows}
+        if values <= allowed:
+            continue
+        bad_values = values - allowed
+        for row_number, row in enumerate(rows):
+            if row[index] in bad_values:
+                invalid.setdefault(row_number, []).append((column, row[index]))
+    return invalid
+
+
+def build_sign(sign_values, symbols):
+    gloss, frequency, coder, update_date, note, *global_values = sign_values
+    if not gloss:
+        raise ValueError('empty gloss')
+    return Sign.from_flat(gloss, float(frequency), coder, date(*map(int, update_date.split(sep='-'))), note,
+                          [parse_bool(value) for value in global_values], symbols)
+
+
+def iter_csv_signs(f, problems):
+    """
+    Yield lists of up to BATCH_SIZE signs read from the open CSV file f.
+    Rows that cannot be imported are skipped and reported in problems as (row number, column, value) tuples;
+    the header is row 1.
+    """
+    reader = csv.reader(f)
+    sign_indices, slot_indices = get_column_indices(next(reader, []))
+    get_sign_values = itemgetter(*sign_indices)
+    get_symbols = itemgetter(*slot_indices)
+    row_length = max(sign_indices + slot_indices) + 1
+
+    row_count = 1
+    while True:
+        rows = list(islice(reader, BATCH_SIZE))
+        if not rows:
+            return
+        first_row = row_count + 1
+        row_count += len(rows)
+
+        short_rows = {row_number for row_number, row in enumerate(rows) if len(row) < row_length}
+        for row_number in short_rows:
+            problems.append((first_row + row_number, '', 'row has {} columns'.format(len(rows[row_number]))))
+        if short_rows:
+            rows = [row if row_number not in short_rows else [''] * row_length
+                    for row_number, row in enumerate(rows)]
+
+        invalid = find_invalid_slots(rows, slot_indices)
+        for row_number in sorted(invalid):
+            if row_number not in short_rows:
+                problems.extend((first_row + row_number, column, value) for column, value in invalid[row_number])
+
+        signs = list()
+        for row_number, row in enumerate(rows):
+            if row_number in short_rows or row_number in invalid:
+                continue
+            try:
+                signs.append(build_sign(get_sign_values(row), get_symbols(row)))
+            except (ValueError, TypeError) as error:
+                problems.append((first_row + row_number, '', str(error)))
+        yield signs
+
+
+def import_csv(file_name, corpus):
+    """
+    Add the signs of a handshape transcription CSV in the individual layout to corpus.
+    A sign replaces the one with the same gloss, so a gloss repeated in the file keeps its last row.
+    Return the number of signs imported and the list of problems of the rows left out.
+    """
+    problems = list()
+    imported = 0
+    with open(file_name, newline='') as f:
+        for signs in iter_csv_signs(f, problems):
+            for sign in signs:
+                corpus.add_sign(sign)
+            imported += len(signs)
+    return imported, sorted(problems)
@@ -0,0 +1,132 @@
+"""
+Export the handshape transcriptions of a corpus to CSV without starting the GUI:
+
+    python -m lexicon.export corpus.slpaa --format individual -o out.csv
+    python -m lexicon.export corpora/ --format single -o csv/ --jobs 4
+
+Nothing here imports gui or PyQt5, so it also runs on a server without a display.
+"""
+import argparse
+import os
+import pickle
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lexicon.corpus_io import CorpusJournal
+from lexicon.csv_export import EXPORT_OPTIONS, export_csv
+from lexicon.sqlite_corpus import SQLITE_CORPUS_EXTENSION, SqliteCorpus, is_sqlite_corpus_path
+
+CORPUS_EXTENSIONS = ('.slpaa', SQLITE_CORPUS_EXTENSION)
+# what a missing, unreadable or corrupt corpus file raises
+EXPORT_ERRORS = (OSError, EOFError, ValueError, pickle.UnpicklingError, sqlite3.DatabaseError)
+
+
+def load_corpus(path):
+    if is_sqlite_corpus_path(path):
+        # sqlite3 would quietly create a new, empty database
+        if not os.path.isfile(path):
+            raise FileNotFoundError('No such file: ' + repr(path))
+        return SqliteCorpus(path)
+    # the signs are unpickled one by one as the exporter reaches them
+    return CorpusJournal(path).load(lazy=True)
+
+
+def export_corpus(path, output, option):
+    """
+    Return the number of signs exported from the corpus at path
+    """
+    corpus = load_corpus(path)
+    try:
+        return export_csv(corpus, output, option)
+    finally:
+        corpus.close()
+
+
+def export_corpus_timed(path, output, option):
+    """
+    Process pool worker: return (path, output, number of signs, seconds, error message or None)
+    """
+    start = time.perf_counter()
+    try:
+        count, error = export_corpus(path, output, option), None
+    except EXPORT_ERRORS as export_error:
+        count, error = 0, str(export_error)
+    except Exception as export_error:
+        # anything else a damaged corpus raises is this corpus' failure too, and must not stop the other exports
+        count, error = 0, '{}: {}'.format(type(export_error).__name__, export_error)
+    return path, output, count, time.perf_counter() - start, error
+
+
+def find_corpora(directory):
+    return sorted(os.path.join(directory, file_name) for file_name in os.listdir(directory)
+                  if os.path.splitext(file_name)[1].lower() in CORPUS_EXTENSIONS)
+
+
+def export_directory(directory, output_directory, option, max_workers=None):
+    """
+    Export every corpus in directory to output_directory, one process per corpus (up to max_workers at a time,
+    the number of CPUs by default), and return the results of export_corpus_timed in file name order
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    jobs = [(path, os.path.join(output_directory, os.path.splitext(os.path.basename(path))[0] + '.csv'), option)
+            for path in find_corpora(directory)]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(export_corpus_timed, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def format_report(results, elapsed):
+    lines = list()
+    for path, output, count, seconds, error in results:
+        if error is None:
+            lines.append('{:>8.2f}s  {:>8} signs  {} -> {}'.format(seconds, count, path, output))
+        else:
+            lines.append('{:>8.2f}s    FAILED        {}: {}'.format(seconds, path, error))
+
+    exported = [result for result in results if result[4] is None]
+    lines.append('{} of {} corpora, {} signs exported in {:.2f}s ({:.2f}s of worker time)'.format(
+        len(exported), len(results), sum(result[2] for result in exported), elapsed,
+        sum(result[3] for result in results)))
+    return '\n'.join(lines)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(prog='python -m lexicon.export',
+                                     description='Export the handshape transcriptions of an SLP-AA corpus to CSV.')
+    parser.add_argument('corpus', help='.slpaa or .slpaadb corpus file, or a directory of them')
+    parser.add_argument('--format', choices=EXPORT_OPTIONS, default='individual',
+                        help='individual: one column per slot; single: one column per hand (default: individual)')
+    parser.add_argument('-o', '--output',
+                        help='CSV file to write (default: the corpus file name with a .csv extension); '
+                             'for a directory of corpora, the directory to write the CSV files in '
+                             '(default: the corpus directory)')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='number of corpora exported at the same time (default: the number of CPUs)')
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+
+    if os.path.isdir(args.corpus):
+        start = time.perf_counter()
+        results = export_directory(args.corpus, args.output or args.corpus, args.format, max_workers=args.jobs)
+        print(format_report(results, time.perf_counter() - start))
+        return 0 if all(result[4] is None for result in results) else 1
+
+    output = args.output or os.path.splitext(args.corpus)[0] + '.csv'
+    try:
+        count = export_corpus(args.corpus, output, args.format)
+    except EXPORT_ERRORS as error:
+        print('Could not export {}: {}'.format(args.corpus, error), file=sys.stderr)
+        return 1
+
+    print('Exported {} signs to {}'.format(count, output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,64 @@
-from itertools import chain
+import sys
+from bisect import bisect_left, insort
+from itertools import chain, repeat
 from copy import deepcopy
 
 NULL = '\u2205'
+X_IN_BOX = '\u2327'
+
+# slot numbers of each field of a hand; slot 1 (forearm) belongs to GlobalHandshapeInformation
+FIELD_SLOTS = {
+    2: (2, 3, 4, 5),
+    3: (6, 7, 8, 9, 10, 11, 12, 13, 14, 15),
+    4: (16, 17, 18, 19),
+    5: (20, 21, 22, 23, 24),
+    6: (25, 26, 27, 28, 29),
+    7: (30, 31, 32, 33, 34)
+}
+HAND_SLOTS = tuple(chain.from_iterable(FIELD_SLOTS.values()))
+SLOT_INDEX = {slot_number: index for index, slot_number in enumerate(HAND_SLOTS)}
+SLOTS_PER_HAND = len(HAND_SLOTS)
+
+# every symbol the transcription slots offer; a symbol's code is its index, so only ever append to this tuple
+SYMBOLS = (
+    '', NULL, '/', '1', '2', '3', '4', '?',
+    'L', 'U', 'O', '{', '<', '=',
+    'H', 'E', 'e', 'i', 'F', 'f',
+    '-', 't', 'fr', 'b', 'r', 'u', 'd', 'p', 'M', 'm',
+    'x-', 'x', 'x+', X_IN_BOX
+)
+SYMBOL_CODES = {symbol: code for code, symbol in enumerate(SYMBOLS)}
+# code of a symbol not in SYMBOLS (free text typed into a slot); the symbol itself is kept aside
+OVERFLOW_CODE = 255
+
+EMPTY_HAND_CODES = bytes(SYMBOL_CODES[symbol] for symbol in [
+    '', '', '', '',
+    '', '', NULL, '/', '', '', '', '', '', '',
+    '1', '', '', '',
+    '', '2', '', '', '',
+    '', '3', '', '', '',
+    '', '4', '', '', ''
+])
+EMPTY_TRANSCRIPTION_CODES = EMPTY_HAND_CODES * 4
+
+
+def encode_symbols(symbols):
+    # map over dict.get keeps the per-symbol lookup out of the interpreter loop
+    return bytearray(map(SYMBOL_CODES.get, symbols, repeat(OVERFLOW_CODE, len(symbols))))
+
+
+def intern_overflow(overflow):
+    # free-text symbols come back from every pickled sign as separate strings; interning shares them across signs
+    return {position: sys.intern(symbol) for position, symbol in overflow.items()} if overflow else overflow
+
+
+def set_slots_state(obj, state):
+    """
+    Restore an object with __slots__ from the plain __dict__ it was pickled with before its class had __slots__
+    """
+    for name, value in state.items():
+        setattr(obj, name, value)
+
 
 def empty_copy(obj):
     class Empty(obj.__class__):
@@ -12,6 +69,9 @@ def empty_copy(obj):
 
 
 class LexicalInformation:
+    # the pickled state is a tuple in this order, so only ever append to __slots__
+    __slots__ = ('_gloss', '_frequency', '_coder', '_update_date', '_note')
+
     def __init__(self, lexical_info):
         self._gloss = lexical_info['gloss']
         self._frequency = lexical_info['frequency']
@@ -19,6 +79,15 @@ class LexicalInformation:
         self._update_date = lexical_info['date']
         self._note = lexical_info['note']
 
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            set_slots_state(self, state)
+        else:
+            self._gloss, self._frequency, self._coder, self._update_date, self._note = state
+
     @property
     def gloss(self):
         return self._gloss
@@ -61,6 +130,9 @@ class LexicalInformation:
 
 
 class GlobalHandshapeInformation:
+    # the pickled state is a tuple in this order, so only ever append to __slots__
+    __slots__ = ('_forearm', '_estimated', '_uncertain', '_incomplete', '_fingerspelled', '_initialized')
+
     def __init__(self, global_handshape_info):
         self._forearm = global_handshape_info['forearm']
         self._estimated = global_handshape_info['estimated']
@@ -69,6 +141,16 @@ class GlobalHandshapeInformation:
         self._fingerspelled = global_handshape_info['fingerspelled']
         self._initialized = global_handshape_info['initialized']
 
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            set_slots_state(self, state)
+        else:
+            (self._forearm, self._estimated, self._uncertain, self._incomplete, self._fingerspelled,
+             self._initialized) = state
+
     @property
     def estimated(self):
         return self._estimated
@@ -119,204 +201,395 @@ class GlobalHandshapeInformation:
 
 
 class HandshapeTranscriptionSlot:
-    def __init__(self, slot_number, symbol, is_estimate, is_uncertain):
+    """
+    View of one slot of a packed HandshapeTranscription
+    """
+    __slots__ = ('_transcription', '_position', '_slot_number')
+
+    def __init__(self, transcription, position, slot_number):
+        self._transcription = transcription
+        self._position = position
         self._slot_number = slot_number
-        self._symbol = symbol
-        self._estimate = is_estimate
-        self._uncertain = is_uncertain
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        # slots pickled before transcriptions were packed are rebuilt by HandshapeTranscription.__setstate__
+        if not isinstance(state, dict):
+            self._transcription, self._position, self._slot_number = state
 
     @property
     def slot_number(self):
         return self._slot_number
 
-    @slot_number.setter
-    def slot_number(self, new_slot_number):
-        self._slot_number = new_slot_number
-
     @property
     def symbol(self):
-        return self._symbol
+        return self._transcription.get_symbol(self._position)
 
     @symbol.setter
     def symbol(self, new_symbol):
-        self._symbol = new_symbol
+        self._transcription.set_symbol(self._position, new_symbol)
 
     @property
     def estimate(self):
-        return self._estimate
+        return self._transcription.get_estimate(self._position)
 
     @estimate.setter
     def estimate(self, new_is_estimate):
-        self._estimate = new_is_estimate
+        self._transcription.set_estimate(self._position, new_is_estimate)
 
     @property
     def uncertain(self):
-        return self._uncertain
+        return self._transcription.get_uncertain(self._position)
 
     @uncertain.setter
     def uncertain(self, new_is_uncertain):
-        self._uncertain = new_is_uncertain
+        self._transcription.set_uncertain(self._position, new_is_uncertain)
 
 
 class HandshapeTranscriptionField:
-    def __init__(self, field_number, slots):
+    """
+    View of one field of a hand of a packed HandshapeTranscription; slots are available as slot2, slot3, ...
+    """
+    def __init__(self, transcription, hand_offset, field_number):
+        self._transcription = transcription
+        self._hand_offset = hand_offset
         self._field_number = field_number
-        self._slots = slots
-
-        self.set_slots()
 
     @property
     def field_number(self):
         return self._field_number
 
-    @field_number.setter
-    def field_number(self, new_field_number):
-        self._field_number = new_field_number
-
-    def set_slots(self):
-        if self._field_number == 2:
-            self.slot2, self.slot3, self.slot4, self.slot5 = [HandshapeTranscriptionSlot(slot['slot_number'], slot['symbol'], slot['estimate'], slot['uncertain']) for slot in self._slots]
-        elif self._field_number == 3:
-            self.slot6, self.slot7, self.slot8, self.slot9, self.slot10, self.slot11, self.slot12, self.slot13, self.slot14, self.slot15 = [HandshapeTranscriptionSlot(slot['slot_number'], slot['symbol'], slot['estimate'], slot['uncertain']) for slot in self._slots]
-        elif self._field_number == 4:
-            self.slot16, self.slot17, self.slot18, self.slot19 = [HandshapeTranscriptionSlot(slot['slot_number'], slot['symbol'], slot['estimate'], slot['uncertain']) for slot in self._slots]
-        elif self._field_number == 5:
-            self.slot20, self.slot21, self.slot22, self.slot23, self.slot24 = [HandshapeTranscriptionSlot(slot['slot_number'], slot['symbol'], slot['estimate'], slot['uncertain']) for slot in self._slots]
-        elif self._field_number == 6:
-            self.slot25, self.slot26, self.slot27, self.slot28, self.slot29 = [HandshapeTranscriptionSlot(slot['slot_number'], slot['symbol'], slot['estimate'], slot['uncertain']) for slot in self._slots]
-        elif self._field_number == 7:
-            self.slot30, self.slot31, self.slot32, self.slot33, self.slot34 = [HandshapeTranscriptionSlot(slot['slot_number'], slot['symbol'], slot['estimate'], slot['uncertain']) for slot in self._slots]
+    def get_slot(self, slot_number):
+        return HandshapeTranscriptionSlot(self._transcription, self._hand_offset + SLOT_INDEX[slot_number], slot_number)
+
+    def __getattr__(self, name):
+        if name.startswith('slot') and name[4:].isdigit() and int(name[4:]) in FIELD_SLOTS.get(self._field_number, ()):
+            return self.get_slot(int(name[4:]))
+        raise AttributeError(name)
 
     def __iter__(self):
-        if self._field_number == 2:
-            return [self.slot2, self.slot3, self.slot4, self.slot5].__iter__()
-        elif self._field_number == 3:
-            return [self.slot6, self.slot7, self.slot8, self.slot9, self.slot10, self.slot11, self.slot12, self.slot13, self.slot14, self.slot15].__iter__()
-        elif self._field_number == 4:
-            return [self.slot16, self.slot17, self.slot18, self.slot19].__iter__()
-        elif self._field_number == 5:
-            return [self.slot20, self.slot21, self.slot22, self.slot23, self.slot24].__iter__()
-        elif self._field_number == 6:
-            return [self.slot25, self.slot26, self.slot27, self.slot28, self.slot29].__iter__()
-        elif self._field_number == 7:
-            return [self.slot30, self.slot31, self.slot32, self.slot33, self.slot34].__iter__()
+        return iter([self.get_slot(slot_number) for slot_number in FIELD_SLOTS[self._field_number]])
 
 
 class HandshapeTranscriptionHand:
-    def __init__(self, hand_number, fields):
+    """
+    View of one hand of a packed HandshapeTranscription
+    """
+    def __init__(self, transcription, hand_offset, hand_number):
+        self._transcription = transcription
+        self._hand_offset = hand_offset
         self._hand_number = hand_number
-        self.field2, self.field3, self.field4, self.field5, self.field6, self.field7 = [HandshapeTranscriptionField(field['field_number'], field['slots']) for field in fields]
 
     @property
     def hand_number(self):
         return self._hand_number
 
-    @hand_number.setter
-    def hand_number(self, new_hand_number):
-        self._hand_number = new_hand_number
+    def get_field(self, field_number):
+        return HandshapeTranscriptionField(self._transcription, self._hand_offset, field_number)
+
+    @property
+    def field2(self):
+        return self.get_field(2)
+
+    @property
+    def field3(self):
+        return self.get_field(3)
+
+    @property
+    def field4(self):
+        return self.get_field(4)
+
+    @property
+    def field5(self):
+        return self.get_field(5)
+
+    @property
+    def field6(self):
+        return self.get_field(6)
+
+    @property
+    def field7(self):
+        return self.get_field(7)
 
     def __iter__(self):
-        return chain(iter(self.field2), iter(self.field3), iter(self.field4), iter(self.field5), iter(self.field6), iter(self.field7))
+        return iter([HandshapeTranscriptionSlot(self._transcription, self._hand_offset + index, slot_number)
+                     for index, slot_number in enumerate(HAND_SLOTS)])
 
     def get_hand_transcription_list(self):
-        return [slot.symbol for slot in self.__iter__()]
+        return self._transcription.get_symbols(self._hand_offset, self._hand_offset + SLOTS_PER_HAND)
+
+    def get_hand_codes(self):
+        """
+        The hand's SYMBOL_CODES as bytes, to compare or look up hands without decoding their symbols;
+        free-text symbols all share OVERFLOW_CODE
+        """
+        return bytes(self._transcription.codes[self._hand_offset:self._hand_offset + SLOTS_PER_HAND])
 
     def get_hand_transcription_string(self):
         return ''.join(self.get_hand_transcription_list())
 
     def is_empty(self):
-        return self.get_hand_transcription_list() == [
-            '', '', '', '',
-            '', '', NULL, '/', '', '', '', '', '', '',
-            '1', '', '', '',
-            '', '2', '', '', '',
-            '', '3', '', '', '',
-            '', '4', '', '', ''
-        ]
+        return self._transcription.is_hand_empty(self._hand_offset)
 
 
 class HandshapeTranscriptionConfig:
-    def __init__(self, config_number, hands):
+    """
+    View of one configuration of a packed HandshapeTranscription
+    """
+    def __init__(self, transcription, config_number):
+        self._transcription = transcription
         self._config_number = config_number
-        self.hand1, self.hand2 = [HandshapeTranscriptionHand(hand['hand_number'], hand['fields']) for hand in hands]
+        config_offset = (config_number - 1) * 2 * SLOTS_PER_HAND
+        self.hand1 = HandshapeTranscriptionHand(transcription, config_offset, 1)
+        self.hand2 = HandshapeTranscriptionHand(transcription, config_offset + SLOTS_PER_HAND, 2)
 
     @property
     def config_number(self):
         return self._config_number
 
-    @config_number.setter
-    def config_number(self, new_config_number):
-        self._config_number = new_config_number
-
     def is_empty(self):
-        return self.hand1.is_empty() and self.hand2.is_empty()
+        return self.find_handedness() == 0
 
     def find_handedness(self):
-        if self.hand1.is_empty() and self.hand2.is_empty():
-            return 0
-        elif not self.hand1.is_empty() and self.hand2.is_empty():
-            return 1
-        elif self.hand1.is_empty() and not self.hand2.is_empty():
-            return 2
-        elif not self.hand1.is_empty() and not self.hand2.is_empty():
-            return 3
+        # 0: both hands empty; 1: only hand1 transcribed; 2: only hand2 transcribed; 3: both hands transcribed
+        return self._transcription.get_config_handedness(self._config_number)
 
     def __iter__(self):
         return [self.hand1, self.hand2].__iter__()
 
 
 class HandshapeTranscription:
+    """
+    Symbols of the 2 configs x 2 hands x 33 slots are packed into one bytearray of SYMBOL_CODES
+    (symbols missing from SYMBOLS are kept in self.overflow), and the estimate/uncertain flags into two int bitsets.
+    config1, config2 and everything below them are thin views over this packed representation.
+    Which hands are empty, handedness and config are worked out on first use and cached until a symbol changes.
+    """
     def __init__(self, configs):
-        self.configs = configs
-        self.config1, self.config2 = [HandshapeTranscriptionConfig(config['config_number'], config['hands']) for config in configs]
-        self.find_properties()
+        self.codes = bytearray(EMPTY_TRANSCRIPTION_CODES)
+        self.estimate_flags = 0
+        self.uncertain_flags = 0
+        self.overflow = None
+        self.invalidate_properties()
+
+        for config in configs:
+            for hand in config['hands']:
+                hand_offset = ((config['config_number'] - 1) * 2 + hand['hand_number'] - 1) * SLOTS_PER_HAND
+                for field in hand['fields']:
+                    for slot in field['slots']:
+                        position = hand_offset + SLOT_INDEX[slot['slot_number']]
+                        self.set_symbol(position, slot['symbol'])
+                        if slot['estimate']:
+                            self.estimate_flags |= 1 << position
+                        if slot['uncertain']:
+                            self.uncertain_flags |= 1 << position
+
+    @classmethod
+    def from_symbols(cls, symbols, estimate_flags=0, uncertain_flags=0):
+        """
+        Build a transcription straight from its 132 symbols in packed order (C1H1, C1H2, C2H1, C2H2; slots 2-34 each)
+        and the estimate/uncertain bitsets, without going through the nested config dicts
+        """
+        if len(symbols) != len(EMPTY_TRANSCRIPTION_CODES):
+            raise ValueError('Expected {} symbols, got {}'.format(len(EMPTY_TRANSCRIPTION_CODES), len(symbols)))
+
+        transcription = cls.__new__(cls)
+        transcription.codes = encode_symbols(symbols)
+        transcription.estimate_flags = estimate_flags
+        transcription.uncertain_flags = uncertain_flags
+        transcription.overflow = None
+        if OVERFLOW_CODE in transcription.codes:
+            transcription.overflow = intern_overflow({position: symbol for position, symbol in enumerate(symbols)
+                                                      if symbol not in SYMBOL_CODES})
+        transcription.invalidate_properties()
+        return transcription
+
+    def __getstate__(self):
+        return bytes(self.codes), self.estimate_flags, self.uncertain_flags, self.overflow
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # transcriptions pickled before packing kept the nested dicts they were built from
+            self.__init__(state['configs'])
+            return
+        codes, self.estimate_flags, self.uncertain_flags, overflow = state
+        self.codes = bytearray(codes)
+        self.overflow = intern_overflow(overflow)
+        self.invalidate_properties()
+
+    def __eq__(self, other):
+        # symbols are compared by their codes, without decoding any of them
+        return isinstance(other, HandshapeTranscription) and self.codes == other.codes \
+            and self.estimate_flags == other.estimate_flags and self.uncertain_flags == other.uncertain_flags \
+            and (self.overflow or None) == (other.overflow or None)
+
+    # mutable, like the nested dicts it replaces
+    __hash__ = None
 
     def __repr__(self):
-        return repr(self.configs)
+        return '<HANDSHAPE TRANSCRIPTION: ' + repr([hand.get_hand_transcription_string() for config in
+                                                    [self.config1, self.config2] for hand in config]) + '>'
 
-    def find_properties(self):
+    @property
+    def config1(self):
+        return HandshapeTranscriptionConfig(self, 1)
+
+    @property
+    def config2(self):
+        return HandshapeTranscriptionConfig(self, 2)
+
+    def get_symbol(self, position):
+        code = self.codes[position]
+        return self.overflow[position] if code == OVERFLOW_CODE else SYMBOLS[code]
+
+    def get_symbols(self, start, stop):
+        symbols = [SYMBOLS[code] if code != OVERFLOW_CODE else None for code in self.codes[start:stop]]
+        if self.overflow:
+            for position, symbol in self.overflow.items():
+                if start <= position < stop:
+                    symbols[position - start] = symbol
+        return symbols
+
+    def set_symbol(self, position, symbol):
+        code = SYMBOL_CODES.get(symbol, OVERFLOW_CODE)
+        self.codes[position] = code
+        self._empty_hands = None
+        if code == OVERFLOW_CODE:
+            if self.overflow is None:
+                self.overflow = dict()
+            self.overflow[position] = sys.intern(symbol)
+        elif self.overflow:
+            self.overflow.pop(position, None)
+
+    def get_estimate(self, position):
+        return bool(self.estimate_flags >> position & 1)
+
+    def set_estimate(self, position, is_estimate):
+        if is_estimate:
+            self.estimate_flags |= 1 << position
+        else:
+            self.estimate_flags &= ~(1 << position)
+
+    def get_uncertain(self, position):
+        return bool(self.uncertain_flags >> position & 1)
+
+    def set_uncertain(self, position, is_uncertain):
+        if is_uncertain:
+            self.uncertain_flags |= 1 << position
+        else:
+            self.uncertain_flags &= ~(1 << position)
+
+    def invalidate_properties(self):
+        self._empty_hands = None
+        self._handedness = None
+        self._config = None
+
+    def get_empty_hands(self):
+        # bit i is set when the i-th hand (C1H1, C1H2, C2H1, C2H2) is empty
+        if self._empty_hands is None:
+            self._empty_hands = 0
+            for hand in range(4):
+                if self.codes[hand * SLOTS_PER_HAND:(hand + 1) * SLOTS_PER_HAND] == EMPTY_HAND_CODES:
+                    self._empty_hands |= 1 << hand
+            self._handedness = None
+            self._config = None
+        return self._empty_hands
+
+    def is_hand_empty(self, hand_offset):
+        return bool(self.get_empty_hands() >> (hand_offset // SLOTS_PER_HAND) & 1)
+
+    def get_config_handedness(self, config_number):
+        # one bit per transcribed hand of the config, so 0: none, 1: hand1 only, 2: hand2 only, 3: both
+        return (~self.get_empty_hands() >> ((config_number - 1) * 2)) & 0b11
+
+    @property
+    def handedness(self):
         # one-handed vs. two-handed
-        self.handedness = self.find_handedness()
+        if self._empty_hands is None or self._handedness is None:
+            self._handedness = self.find_handedness()
+        return self._handedness
 
+    @property
+    def config(self):
         # one-config vs. two-config
-        self.config = self.find_config()
+        if self._empty_hands is None or self._config is None:
+            self._config = self.find_config()
+        return self._config
+
+    def find_properties(self):
+        self.invalidate_properties()
+        return self.handedness, self.config
 
     def find_handedness(self):
-        if self.config1.is_empty() and self.config2.is_empty():
+        config1, config2 = self.get_config_handedness(1), self.get_config_handedness(2)
+        if config1 == 0 and config2 == 0:
             return 0
-        elif self.config1.find_handedness() == 3 or self.config2.find_handedness() == 3:
+        elif config1 == 3 or config2 == 3:
             return 2
-        elif self.config1.find_handedness() == 1 and self.config2.find_handedness() == 2:
+        elif config1 == 1 and config2 == 2:
             return 2
-        elif self.config2.find_handedness() == 1 and self.config1.find_handedness() == 2:
+        elif config2 == 1 and config1 == 2:
             return 2
         else:
             return 1
 
     def find_config(self):
-        if self.config1.is_empty() and self.config2.is_empty():
+        config1, config2 = self.get_config_handedness(1), self.get_config_handedness(2)
+        if config1 == 0 and config2 == 0:
             return 0
-        elif self.config1.is_empty() and not self.config2.is_empty():
+        elif config1 == 0 and config2 != 0:
             return 2
-        elif not self.config1.is_empty() and self.config2.is_empty():
+        elif config1 != 0 and config2 == 0:
             return 1
         else:
             return 3
 
 
 class LocationPoint:
+    __slots__ = ('points',)
+
     def __init__(self, location_point_info):
         self.points = location_point_info
         #self.loc_identifier = location_point_info['image']
         #self.point = Point(location_point_info['point']) if location_point_info['point'] else None
 
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            set_slots_state(self, state)
+        else:
+            self.points = state[0]
+
 
 class LocationHand:
+    # the pickled state is a tuple in this order, so only ever append to __slots__
+    __slots__ = ('contact', 'D', 'W')
+
     def __init__(self, location_hand_info):
         self.contact = location_hand_info['contact']
         self.D = LocationPoint(location_hand_info['D'])
         self.W = LocationPoint(location_hand_info['W'])
 
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            set_slots_state(self, state)
+        else:
+            self.contact, self.D, self.W = state
+
+
+def empty_location_transcription_info():
+    return {
+        'start': {'contact': 0, 'D': [], 'W': []},
+        'end': {'contact': 0, 'D': [], 'W': []}
+    }
+
 
 class LocationTranscription:
     def __init__(self, location_transcription_info):
@@ -341,6 +614,24 @@ class Sign:
         self.handshape_transcription = HandshapeTranscription(configs)
         self.location = LocationTranscription(location_transcription_info)
 
+    @classmethod
+    def from_flat(cls, gloss, frequency, coder, update_date, note, global_flags, symbols,
+                  estimate_flags=0, uncertain_flags=0, location_transcription_info=None):
+        """
+        Build a sign from flat values instead of nested dicts:
+        global_flags are forearm, estimated, uncertain, incomplete, fingerspelled and initialized, in that order;
+        symbols and the estimate/uncertain bitsets are as in HandshapeTranscription.from_symbols
+        """
+        sign = cls.__new__(cls)
+
+        sign.lexical_information = LexicalInformation.__new__(LexicalInformation)
+        sign.lexical_information.__setstate__((gloss, frequency, coder, update_date, note))
+        sign.global_handshape_information = GlobalHandshapeInformation.__new__(GlobalHandshapeInformation)
+        sign.global_handshape_information.__setstate__(tuple(global_flags))
+        sign.handshape_transcription = HandshapeTranscription.from_symbols(symbols, estimate_flags, uncertain_flags)
+        sign.location = LocationTranscription(location_transcription_info or empty_location_transcription_info())
+        return sign
+
     def __hash__(self):
         return hash(self.lexical_information.gloss)
 
@@ -437,20 +728,123 @@ class Locations:
         return iter(self.keys())
 
 
-class Corpus:
+class GlossView:
+    """
+    Read-only, live view of the sorted glosses of a corpus; avoids copying the gloss list for every caller
+    """
+    def __init__(self, sorted_glosses):
+        self._sorted_glosses = sorted_glosses
+
+    def __getitem__(self, index):
+        return self._sorted_glosses[index]
+
+    def __len__(self):
+        return len(self._sorted_glosses)
+
+    def __iter__(self):
+        return iter(self._sorted_glosses)
+
+    def __contains__(self, gloss):
+        index = bisect_left(self._sorted_glosses, gloss)
+        return index < len(self._sorted_glosses) and self._sorted_glosses[index] == gloss
+
+    def index(self, gloss):
+        index = bisect_left(self._sorted_glosses, gloss)
+        if index < len(self._sorted_glosses) and self._sorted_glosses[index] == gloss:
+            return index
+        raise ValueError(repr(gloss) + ' is not in the corpus')
+
+    def __repr__(self):
+        return repr(self._sorted_glosses)
+
+
+class BaseCorpus:
+    """
+    What every corpus offers, whether its signs are held in memory (Corpus) or in a file (LazyCorpus, SqliteCorpus).
+    Subclasses provide get_sign_glosses, get_previous_sign, get_sign_by_gloss, has_gloss, add_sign, remove_sign,
+    __iter__ and __len__, and record every sign they add or remove in pending_changes.
+    """
+    def __init__(self):
+        # signs added (gloss: Sign) or removed (gloss: None) since the last save
+        self.pending_changes = dict()
+        # TranscriptionIndex, only built once a transcription query is made
+        self.transcription_index = None
+
+    def clear_pending_changes(self):
+        self.pending_changes.clear()
+
+    def get_transcription_index(self):
+        if self.transcription_index is None:
+            from lexicon.transcription_index import TranscriptionIndex
+            self.transcription_index = TranscriptionIndex(self)
+        return self.transcription_index
+
+    def find_glosses(self, conditions):
+        """
+        Sorted glosses of the signs meeting all of the conditions, each one being
+        (config_number, hand_number, slot_number, symbol), e.g. [(1, 1, 16, 'E'), (1, 1, 20, 'F')]
+        """
+        return self.get_transcription_index().find(conditions)
+
+    def to_columnar(self):
+        """
+        Return a lexicon.columnar.ColumnarCorpus snapshot of the signs in gloss order; requires NumPy
+        """
+        from lexicon.columnar import ColumnarCorpus
+        return ColumnarCorpus(self.get_sign_by_gloss(gloss) for gloss in self.get_sign_glosses())
+
+    def open_reader(self):
+        """
+        Return a corpus to read this one from another thread, to be closed with close() when done
+        """
+        return self
+
+    def close(self):
+        pass
+
+    def __contains__(self, item):
+        return self.has_gloss(item.lexical_information.gloss)
+
+
+class Corpus(BaseCorpus):
     #TODO: need a default for location_definition
     def __init__(self, name='Untitled', signs=None, location_definition=None, path=None):
+        super().__init__()
         self.name = name
         self.signs = signs if signs else set()
         self.location_definition = location_definition
         self.path = path
 
+        self.build_indices()
+
+    def build_indices(self):
+        # gloss -> Sign, kept in step with self.signs by add_sign/remove_sign
+        self.gloss_index = {sign.lexical_information.gloss: sign for sign in self.signs}
+        # glosses in sorted order, maintained with bisect instead of re-sorting on every call
+        self.sorted_glosses = sorted(self.gloss_index)
+        # TranscriptionIndex, only built once a transcription query is made
+        self.transcription_index = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['pending_changes'] = dict()
+        del state['gloss_index']
+        del state['sorted_glosses']
+        del state['transcription_index']
+        return state
+
+    def __setstate__(self, state):
+        # corpora pickled before the change tracking was added do not carry 'pending_changes'
+        state.setdefault('pending_changes', dict())
+        self.__dict__.update(state)
+        self.build_indices()
+
     def get_sign_glosses(self):
-        return sorted([sign.lexical_information.gloss for sign in self.signs])
+        return GlossView(self.sorted_glosses)
 
     def get_previous_sign(self, gloss):
-        sign_glosses = self.get_sign_glosses()
-        current_index = sign_glosses.index(gloss)
+        sign_glosses = self.sorted_glosses
+        current_index = bisect_left(sign_glosses, gloss)
 
         # if the very first sign is selected, then return the one after it, otherwise the previous one
         previous_gloss = sign_glosses[current_index-1] if current_index-1 >= 0 else sign_glosses[1]
@@ -459,18 +853,31 @@ class Corpus:
 
     def get_sign_by_gloss(self, gloss):
         # Every sign has a unique gloss, so this function will always return one sign
-        for sign in self.signs:
-            if sign.lexical_information.gloss == gloss:
-                return sign
+        return self.gloss_index.get(gloss)
+
+    def has_gloss(self, gloss):
+        return gloss in self.gloss_index
 
     def add_sign(self, new_sign):
+        gloss = new_sign.lexical_information.gloss
+        # a sign with the same gloss is replaced, so that the set and the index always hold the same object
+        self.signs.discard(new_sign)
         self.signs.add(new_sign)
+        if gloss not in self.gloss_index:
+            insort(self.sorted_glosses, gloss)
+        self.gloss_index[gloss] = new_sign
+        self.pending_changes[gloss] = new_sign
+        if self.transcription_index is not None:
+            self.transcription_index.add(new_sign)
 
     def remove_sign(self, trash_sign):
+        gloss = trash_sign.lexical_information.gloss
         self.signs.remove(trash_sign)
-
-    def __contains__(self, item):
-        return item in self.signs
+        del self.gloss_index[gloss]
+        del self.sorted_glosses[bisect_left(self.sorted_glosses, gloss)]
+        self.pending_changes[gloss] = None
+        if self.transcription_index is not None:
+            self.transcription_index.remove(gloss)
 
     def __iter__(self):
         return iter(self.signs)
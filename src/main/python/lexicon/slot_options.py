@@ -0,0 +1,140 @@
+from lexicon.lexicon_classes import NULL, X_IN_BOX, FIELD_SLOTS, HAND_SLOTS, SYMBOL_CODES
+
+FLEXION_OPTIONS = ['H [hyperextended]', 'E [fully extended]', 'e [somewhat extended]', 'i [clearly intermediate]',
+                   'F [fully flexed]', 'f [somewhat flexed]', '? [unestimatable]']
+SURFACE_OPTIONS = ['- [no contact]', 't [tip]', 'fr [friction surface]', 'b [back surface]', 'r [radial surface]',
+                   'u [ulnar surface]', '? [unestimatable]']
+FINGER_CONTACT_OPTIONS = ['{ [full abduction]', '< [neutral]', '= [adducted]', 'x- [slightly crossed with contact]',
+                          'x [crossed with contact]', 'x+ [ultracrossed]', X_IN_BOX + ' [crossed without contact]',
+                          '? [unestimatable]']
+
+# what each field of a hand transcribes, and each editable slot in it
+FIELD_TYPES = {
+    2: 'thumb',
+    3: 'thumb/finger contact',
+    4: 'index finger',
+    5: 'middle finger',
+    6: 'ring finger',
+    7: 'pinky finger'
+}
+SLOT_TYPES = {
+    2: 'thumb oppositional positions (CM rotation)',
+    3: 'thumb abduction/adduction (CM adduction)',
+    4: 'thumb MCP flexion',
+    5: 'thumb DIP flexion',
+    6: 'thumb surface options',
+    7: 'thumb bone options',
+    10: 'finger surface options',
+    11: 'finger bone options',
+    12: 'index/thumb contact',
+    13: 'middle/thumb contact',
+    14: 'ring/thumb contact',
+    15: 'pinky/thumb contact',
+    17: 'index MCP flexion',
+    18: 'index PIP flexion',
+    19: 'index DIP flexion',
+    20: 'index/middle contact',
+    22: 'middle MCP flexion',
+    23: 'middle PIP flexion',
+    24: 'middle DIP flexion',
+    25: 'middle/ring contact',
+    27: 'Ring MCP flexion',
+    28: 'Ring PIP flexion',
+    29: 'Ring DIP flexion',
+    30: 'ring/pinky contact',
+    32: 'Pinky MCP flexion',
+    33: 'Pinky PIP flexion',
+    34: 'Pinky DIP flexion'
+}
+
+# completer options of every editable slot
+SLOT_OPTIONS = {
+    2: ['L [lateral]', 'U [unopposed]', 'O [opposed]', '? [unestimatable]'],
+    3: ['{ [full abduction]', '< [neutral]', '= [adducted]', '? [unestimatable]'],
+    4: FLEXION_OPTIONS,
+    5: FLEXION_OPTIONS,
+    6: SURFACE_OPTIONS,
+    7: ['- [no contact]', 'd [distal]', 'p [proximal]', 'M [meta-carpal]', '? [unestimatable]'],
+    10: SURFACE_OPTIONS,
+    11: ['- [no contact]', 'd [distal]', 'm [medial]', 'p [proximal]', 'M [meta-carpal]', '? [unestimatable]'],
+    12: ['- [no contact]', '1 [contact with index finger]', '? [unestimatable]'],
+    13: ['- [no contact]', '2 [contact with middle finger]', '? [unestimatable]'],
+    14: ['- [no contact]', '3 [contact with ring finger]', '? [unestimatable]'],
+    15: ['- [no contact]', '4 [contact with pinky finger]', '? [unestimatable]'],
+    17: FLEXION_OPTIONS,
+    18: FLEXION_OPTIONS,
+    19: FLEXION_OPTIONS,
+    20: FINGER_CONTACT_OPTIONS,
+    22: FLEXION_OPTIONS,
+    23: FLEXION_OPTIONS,
+    24: FLEXION_OPTIONS,
+    25: FINGER_CONTACT_OPTIONS,
+    27: FLEXION_OPTIONS,
+    28: FLEXION_OPTIONS,
+    29: FLEXION_OPTIONS,
+    30: FINGER_CONTACT_OPTIONS,
+    32: FLEXION_OPTIONS,
+    33: FLEXION_OPTIONS,
+    34: FLEXION_OPTIONS
+}
+
+# slots that cannot be edited and always hold the same symbol
+FIXED_SLOT_SYMBOLS = {8: NULL, 9: '/', 16: '1', 21: '2', 26: '3', 31: '4'}
+
+
+def get_option_symbol(option):
+    # a completer option is the symbol followed by its description, the same split ConfigSlot.on_text_changed does
+    return option.split(sep=' ')[0]
+
+
+def get_allowed_symbols(slot_number):
+    if slot_number in FIXED_SLOT_SYMBOLS:
+        return frozenset([FIXED_SLOT_SYMBOLS[slot_number]])
+    # an editable slot may also be left empty
+    return frozenset([''] + [get_option_symbol(option) for option in SLOT_OPTIONS[slot_number]])
+
+
+ALLOWED_SYMBOLS = {slot_number: get_allowed_symbols(slot_number) for slot_number in HAND_SLOTS}
+# field number of every slot
+SLOT_FIELDS = {slot_number: field_number for field_number, slots in FIELD_SLOTS.items() for slot_number in slots}
+
+
+class SlotSpec:
+    """
+    Everything about one slot of a hand that does not depend on a sign; gui.hand_configuration builds its slot widgets
+    from these, and the lexicon validates transcriptions with them
+    """
+    __slots__ = ('slot_number', 'field_number', 'field_type', 'slot_type', 'options', 'fixed_symbol',
+                 'allowed_symbols', 'allowed_codes')
+
+    def __init__(self, slot_number):
+        self.slot_number = slot_number
+        self.field_number = SLOT_FIELDS[slot_number]
+        self.field_type = FIELD_TYPES[self.field_number]
+        self.slot_type = SLOT_TYPES.get(slot_number, '')
+        self.options = SLOT_OPTIONS.get(slot_number, [])
+        # None for an editable slot
+        self.fixed_symbol = FIXED_SLOT_SYMBOLS.get(slot_number)
+        self.allowed_symbols = ALLOWED_SYMBOLS[slot_number]
+        self.allowed_codes = frozenset(SYMBOL_CODES[symbol] for symbol in self.allowed_symbols)
+
+    @property
+    def editable(self):
+        return self.fixed_symbol is None
+
+
+SLOT_SPECS = {slot_number: SlotSpec(slot_number) for slot_number in HAND_SLOTS}
+FIELD_SLOT_SPECS = {field_number: [SLOT_SPECS[slot_number] for slot_number in slot_numbers]
+                    for field_number, slot_numbers in FIELD_SLOTS.items()}
+# allowed codes of every position of a packed HandshapeTranscription
+POSITION_ALLOWED_CODES = [SLOT_SPECS[slot_number].allowed_codes for slot_number in HAND_SLOTS] * 4
+
+
+def find_invalid_symbols(transcription):
+    """
+    Return (position, slot number, symbol) for every slot of a HandshapeTranscription holding a symbol its slot does
+    not allow; codes are checked without decoding any symbol
+    """
+    return [(position, HAND_SLOTS[position % len(HAND_SLOTS)], transcription.get_symbol(position))
+            for position, (code, allowed) in enumerate(zip(transcription.codes, POSITION_ALLOWED_CODES))
+            if code not in allowed]
@@ -0,0 +1,149 @@
+import pickle
+import sqlite3
+
+from lexicon.lexicon_classes import BaseCorpus
+
+SQLITE_CORPUS_EXTENSION = '.slpaadb'
+
+
+def is_sqlite_corpus_path(path):
+    return path is not None and path.lower().endswith(SQLITE_CORPUS_EXTENSION)
+
+
+class SqliteCorpus(BaseCorpus):
+    """
+    Same interface as lexicon_classes.Corpus, but signs live in an indexed SQLite file instead of an in-memory set.
+    Only the signs being looked at are unpickled, once: later lookups return the same Sign, as with Corpus.
+    add_sign/remove_sign touch a single row and are committed on save.
+    """
+    def __init__(self, path, name='Untitled', location_definition=None):
+        super().__init__()
+        self.path = path
+        # gloss -> Sign, for the signs unpickled or added so far
+        self.gloss_index = dict()
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB NOT NULL)')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS signs (gloss TEXT PRIMARY KEY, data BLOB NOT NULL)')
+        self.connection.commit()
+
+        if self.get_meta('name') is None:
+            self.name = name
+            self.location_definition = location_definition
+            self.commit()
+
+    @classmethod
+    def from_corpus(cls, corpus, path):
+        sqlite_corpus = cls(path)
+        sqlite_corpus.name = corpus.name
+        sqlite_corpus.location_definition = corpus.location_definition
+        sqlite_corpus.connection.execute('DELETE FROM signs')
+        # the signs carry on as they are, so that whoever holds one still holds the corpus's
+        sqlite_corpus.gloss_index = {sign.lexical_information.gloss: sign for sign in corpus}
+        sqlite_corpus.connection.executemany(
+            'INSERT OR REPLACE INTO signs (gloss, data) VALUES (?, ?)',
+            ((gloss, pickle.dumps(sign, protocol=pickle.HIGHEST_PROTOCOL))
+             for gloss, sign in sqlite_corpus.gloss_index.items())
+        )
+        sqlite_corpus.commit()
+        return sqlite_corpus
+
+    def get_meta(self, key):
+        row = self.connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set_meta(self, key, value):
+        self.connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                                (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+
+    @property
+    def name(self):
+        return self.get_meta('name')
+
+    @name.setter
+    def name(self, new_name):
+        self.set_meta('name', new_name)
+
+    @property
+    def location_definition(self):
+        return self.get_meta('location_definition')
+
+    @location_definition.setter
+    def location_definition(self, new_location_definition):
+        self.set_meta('location_definition', new_location_definition)
+
+    def commit(self):
+        self.connection.commit()
+        self.clear_pending_changes()
+
+    def open_reader(self):
+        # an SQLite connection cannot be shared across threads
+        return SqliteCorpus(self.path)
+
+    def close(self):
+        self.connection.close()
+
+    def get_sign_glosses(self):
+        return [gloss for gloss, in self.connection.execute('SELECT gloss FROM signs ORDER BY gloss')]
+
+    def get_previous_sign(self, gloss):
+        # if the very first sign is selected, then return the one after it, otherwise the previous one
+        row = self.connection.execute('SELECT gloss FROM signs WHERE gloss < ? ORDER BY gloss DESC LIMIT 1',
+                                      (gloss,)).fetchone()
+        if row is None:
+            row = self.connection.execute('SELECT gloss FROM signs WHERE gloss > ? ORDER BY gloss LIMIT 1',
+                                          (gloss,)).fetchone()
+
+        return self.get_sign_by_gloss(row[0]) if row else None
+
+    def get_sign_by_gloss(self, gloss):
+        sign = self.gloss_index.get(gloss)
+        if sign is None:
+            row = self.connection.execute('SELECT data FROM signs WHERE gloss = ?', (gloss,)).fetchone()
+            if row is not None:
+                sign = self.gloss_index[gloss] = pickle.loads(row[0])
+        return sign
+
+    def has_gloss(self, gloss):
+        return gloss in self.gloss_index or \
+            self.connection.execute('SELECT 1 FROM signs WHERE gloss = ?', (gloss,)).fetchone() is not None
+
+    def add_sign(self, new_sign):
+        gloss = new_sign.lexical_information.gloss
+        self.connection.execute('INSERT OR REPLACE INTO signs (gloss, data) VALUES (?, ?)',
+                                (gloss, pickle.dumps(new_sign, protocol=pickle.HIGHEST_PROTOCOL)))
+        self.gloss_index[gloss] = new_sign
+        self.pending_changes[gloss] = new_sign
+        if self.transcription_index is not None:
+            self.transcription_index.add(new_sign)
+
+    def remove_sign(self, trash_sign):
+        gloss = trash_sign.lexical_information.gloss
+        cursor = self.connection.execute('DELETE FROM signs WHERE gloss = ?', (gloss,))
+        if cursor.rowcount == 0:
+            raise KeyError(trash_sign)
+        self.gloss_index.pop(gloss, None)
+        self.pending_changes[gloss] = None
+        if self.transcription_index is not None:
+            self.transcription_index.remove(gloss)
+
+    def to_columnar(self):
+        from lexicon.columnar import ColumnarCorpus
+        # one query in gloss order rather than one per sign
+        return ColumnarCorpus(self)
+
+    def __iter__(self):
+        # in gloss order; signs already unpickled are not unpickled again
+        for gloss, data in self.connection.execute('SELECT gloss, data FROM signs ORDER BY gloss'):
+            sign = self.gloss_index.get(gloss)
+            if sign is None:
+                sign = self.gloss_index[gloss] = pickle.loads(data)
+            yield sign
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM signs').fetchone()[0]
+
+    def __repr__(self):
+        return '<SQLITE CORPUS: ' + repr(self.name) + '>'
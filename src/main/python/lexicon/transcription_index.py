@@ -0,0 +1,124 @@
+from lexicon.lexicon_classes import EMPTY_TRANSCRIPTION_CODES, SYMBOLS, OVERFLOW_CODE, SLOT_INDEX, SLOTS_PER_HAND
+
+TRANSCRIPTION_LENGTH = len(EMPTY_TRANSCRIPTION_CODES)
+# the symbol each position holds in an empty transcription
+DEFAULT_SYMBOLS = tuple(SYMBOLS[code] for code in EMPTY_TRANSCRIPTION_CODES)
+# bytes.translate table turning every code into b'0'
+BINARY_DIGITS = b'0' * 256
+
+
+def get_position(config_number, hand_number, slot_number):
+    return ((config_number - 1) * 2 + hand_number - 1) * SLOTS_PER_HAND + SLOT_INDEX[slot_number]
+
+
+def iter_bits(bitset):
+    # indices of the set bits, lowest first
+    for index, bit in enumerate(reversed(bin(bitset)[2:])):
+        if bit == '1':
+            yield index
+
+
+class TranscriptionIndex:
+    """
+    Inverted index of handshape transcriptions: (config, hand, slot, symbol) -> signs holding that symbol there.
+    Every sign gets a small integer id and a posting is an int bitset over those ids (as with the estimate/uncertain
+    flags of HandshapeTranscription), so a compound query is a chain of &.
+    Only symbols differing from an empty transcription are posted; the posting of the empty symbol of a slot is
+    worked out from the others.
+    A sign is indexed as it is when added, so an edited sign has to go through Corpus.add_sign again.
+    """
+    def __init__(self, signs=()):
+        self.gloss_ids = dict()
+        # id -> gloss, None for a free id
+        self.id_glosses = list()
+        self.free_ids = list()
+        # position -> {symbol: bitset}
+        self.postings = [dict() for _ in range(TRANSCRIPTION_LENGTH)]
+        # every id in use
+        self.all_ids = 0
+
+        self.build(signs)
+
+    def build(self, signs):
+        transcriptions = list()
+        for sign in signs:
+            self.get_new_id(sign.lexical_information.gloss)
+            transcriptions.append(sign.handshape_transcription)
+        self.all_ids = (1 << len(transcriptions)) - 1
+
+        # the codes of every sign back to back, so that the codes of one position across all signs are a single
+        # slice; each posting is then packed by translating that slice into a string of binary digits
+        codes = b''.join(bytes(transcription.codes) for transcription in transcriptions)
+        for position in range(TRANSCRIPTION_LENGTH):
+            column = codes[position::TRANSCRIPTION_LENGTH]
+            for code in set(column) - {EMPTY_TRANSCRIPTION_CODES[position], OVERFLOW_CODE}:
+                table = BINARY_DIGITS[:code] + b'1' + BINARY_DIGITS[code + 1:]
+                self.postings[position][SYMBOLS[code]] = int(column.translate(table)[::-1], 2)
+
+        for sign_id, transcription in enumerate(transcriptions):
+            if transcription.overflow:
+                for position, symbol in transcription.overflow.items():
+                    self.postings[position][symbol] = self.postings[position].get(symbol, 0) | 1 << sign_id
+
+    def get_new_id(self, gloss):
+        if self.free_ids:
+            sign_id = self.free_ids.pop()
+            self.id_glosses[sign_id] = gloss
+        else:
+            sign_id = len(self.id_glosses)
+            self.id_glosses.append(gloss)
+        self.gloss_ids[gloss] = sign_id
+        return sign_id
+
+    def add(self, sign):
+        gloss = sign.lexical_information.gloss
+        if gloss in self.gloss_ids:
+            self.remove(gloss)
+
+        bit = 1 << self.get_new_id(gloss)
+        symbols = sign.handshape_transcription.get_symbols(0, TRANSCRIPTION_LENGTH)
+        for position, symbol in enumerate(symbols):
+            if symbol != DEFAULT_SYMBOLS[position]:
+                self.postings[position][symbol] = self.postings[position].get(symbol, 0) | bit
+        self.all_ids |= bit
+
+    def remove(self, gloss):
+        sign_id = self.gloss_ids.pop(gloss)
+        bit = 1 << sign_id
+        for symbols in self.postings:
+            for symbol, posting in list(symbols.items()):
+                if posting & bit:
+                    if posting == bit:
+                        del symbols[symbol]
+                    else:
+                        symbols[symbol] = posting ^ bit
+        self.all_ids ^= bit
+
+        self.id_glosses[sign_id] = None
+        self.free_ids.append(sign_id)
+
+    def get_posting(self, config_number, hand_number, slot_number, symbol):
+        position = get_position(config_number, hand_number, slot_number)
+        if symbol != DEFAULT_SYMBOLS[position]:
+            return self.postings[position].get(symbol, 0)
+
+        # the signs that have not posted any other symbol for this slot
+        posted = 0
+        for posting in self.postings[position].values():
+            posted |= posting
+        return self.all_ids & ~posted
+
+    def find(self, conditions):
+        """
+        Glosses, in sorted order, of the signs meeting all of the conditions,
+        each one being (config_number, hand_number, slot_number, symbol)
+        """
+        result = self.all_ids
+        for condition in conditions:
+            result &= self.get_posting(*condition)
+            if not result:
+                return []
+        return sorted(self.id_glosses[sign_id] for sign_id in iter_bits(result))
+
+    def __len__(self):
+        return len(self.gloss_ids)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# `fbs test` puts src/main/python on the path before discovering these tests; this does the same under pytest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, 'main', 'python'))
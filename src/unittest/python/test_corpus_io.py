@@ -0,0 +1,368 @@
+import os
+import pickle
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmark.synthetic import get_rng, make_corpus, random_flat_sign
+from lexicon import corpus_io
+from lexicon.corpus_io import CODECS, COMMIT, MAGIC, MAGIC_PREFIX, CorpusJournal, LazyCorpus
+from lexicon.lexicon_classes import Sign
+
+
+def new_sign(index, seed=1):
+    return Sign.from_flat(*random_flat_sign(get_rng(seed + index), index))
+
+
+def read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def write_file(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def save_without_commit(journal, corpus):
+    """
+    Save corpus as if the process died right before writing the COMMIT record
+    """
+    write_record = corpus_io.write_record
+
+    def crash(f, op, key=b'', payload=b''):
+        if op == COMMIT:
+            raise KeyboardInterrupt
+        return write_record(f, op, key, payload)
+
+    with patch.object(corpus_io, 'write_record', crash):
+        try:
+            journal.save(corpus)
+        except KeyboardInterrupt:
+            pass
+
+
+class JournalTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'corpus.slpaa')
+        self.corpus = make_corpus(20)
+        self.corpus.path = self.path
+
+    def assertSameSigns(self, loaded, expected):
+        self.assertEqual(list(loaded.get_sign_glosses()), list(expected.get_sign_glosses()))
+        for gloss in expected.get_sign_glosses():
+            loaded_sign = loaded.get_sign_by_gloss(gloss)
+            expected_sign = expected.get_sign_by_gloss(gloss)
+            self.assertEqual(loaded_sign.handshape_transcription, expected_sign.handshape_transcription)
+            self.assertEqual(loaded_sign.lexical_information.__getstate__(),
+                             expected_sign.lexical_information.__getstate__())
+
+    def assertLoads(self, expected):
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                loaded = CorpusJournal(self.path).load(lazy=lazy)
+                self.assertIsInstance(loaded, LazyCorpus if lazy else type(expected))
+                self.assertEqual(loaded.name, expected.name)
+                self.assertEqual(loaded.path, self.path)
+                self.assertFalse(loaded.pending_changes)
+                self.assertSameSigns(loaded, expected)
+
+
+class SaveTest(JournalTestCase):
+    def test_save_then_load(self):
+        CorpusJournal(self.path).save(self.corpus)
+        self.assertTrue(read_file(self.path).startswith(MAGIC))
+        self.assertFalse(self.corpus.pending_changes)
+        self.assertLoads(self.corpus)
+
+    def test_incremental_save_appends(self):
+        journal = CorpusJournal(self.path)
+        journal.save(self.corpus)
+        snapshot = read_file(self.path)
+
+        self.corpus.add_sign(new_sign(100))
+        journal.save(self.corpus)
+        content = read_file(self.path)
+        self.assertTrue(content.startswith(snapshot))
+        self.assertGreater(len(content), len(snapshot))
+        self.assertLoads(self.corpus)
+
+    def test_incremental_save_replaces_sign(self):
+        journal = CorpusJournal(self.path)
+        journal.save(self.corpus)
+        replacement = Sign.from_flat('sign0000003', *random_flat_sign(get_rng(50), 50)[1:])
+        self.corpus.add_sign(replacement)
+        journal.save(self.corpus)
+
+        for lazy in (False, True):
+            loaded = CorpusJournal(self.path).load(lazy=lazy)
+            self.assertEqual(loaded.get_sign_by_gloss('sign0000003').handshape_transcription,
+                             replacement.handshape_transcription)
+            self.assertEqual(len(loaded), 20)
+
+    def test_save_after_load(self):
+        CorpusJournal(self.path).save(self.corpus)
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                journal = CorpusJournal(self.path)
+                loaded = journal.load(lazy=lazy)
+                sign = new_sign(200 + lazy)
+                loaded.add_sign(sign)
+                self.corpus.add_sign(sign)
+                journal.save(loaded)
+                self.assertLoads(self.corpus)
+
+    def test_delete(self):
+        journal = CorpusJournal(self.path)
+        journal.save(self.corpus)
+        snapshot = read_file(self.path)
+
+        self.corpus.remove_sign(self.corpus.get_sign_by_gloss('sign0000005'))
+        journal.save(self.corpus)
+        self.assertTrue(read_file(self.path).startswith(snapshot))
+        self.assertLoads(self.corpus)
+        self.assertNotIn('sign0000005', CorpusJournal(self.path).load().get_sign_glosses())
+
+    def test_delete_then_add_back(self):
+        journal = CorpusJournal(self.path)
+        journal.save(self.corpus)
+        sign = self.corpus.get_sign_by_gloss('sign0000005')
+        self.corpus.remove_sign(sign)
+        journal.save(self.corpus)
+        self.corpus.add_sign(sign)
+        journal.save(self.corpus)
+        self.assertLoads(self.corpus)
+
+    def test_name_change_only(self):
+        journal = CorpusJournal(self.path)
+        journal.save(self.corpus)
+        self.corpus.name = 'renamed'
+        journal.save(self.corpus)
+        self.assertEqual(CorpusJournal(self.path).load(lazy=True).name, 'renamed')
+
+
+class CompactionTest(JournalTestCase):
+    def test_compaction_past_threshold(self):
+        journal = CorpusJournal(self.path)
+        journal.save(self.corpus)
+
+        with patch.object(corpus_io, 'COMPACT_MIN_RECORDS', 5):
+            compacted = False
+            for index in range(20):
+                self.corpus.add_sign(new_sign(index % 3))
+                before = os.path.getsize(self.path)
+                journal.save(self.corpus)
+                if os.path.getsize(self.path) < before:
+                    compacted = True
+                    break
+        self.assertTrue(compacted)
+        # a fresh snapshot: the META, TOC and COMMIT records and one ADD record per sign
+        self.assertEqual(journal.record_count, len(self.corpus) + 3)
+        fresh_path = os.path.join(self.directory.name, 'fresh.slpaa')
+        CorpusJournal(fresh_path).save(self.corpus)
+        self.assertEqual(read_file(self.path), read_file(fresh_path))
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+        self.assertLoads(self.corpus)
+
+    def test_no_compaction_below_threshold(self):
+        journal = CorpusJournal(self.path)
+        journal.save(self.corpus)
+        for index in range(5):
+            self.corpus.add_sign(new_sign(index))
+            before = read_file(self.path)
+            journal.save(self.corpus)
+            self.assertTrue(read_file(self.path).startswith(before))
+
+    def test_compact_lazy_corpus(self):
+        CorpusJournal(self.path).save(self.corpus)
+        journal = CorpusJournal(self.path)
+        loaded = journal.load(lazy=True)
+        loaded.get_sign_by_gloss('sign0000001')
+        loaded.remove_sign(loaded.get_sign_by_gloss('sign0000002'))
+        self.corpus.remove_sign(self.corpus.get_sign_by_gloss('sign0000002'))
+        journal.compact(loaded)
+        self.assertEqual(journal.record_count, len(self.corpus) + 3)
+        self.assertSameSigns(loaded, self.corpus)
+        self.assertLoads(self.corpus)
+
+
+class TornAppendTest(JournalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.journal = CorpusJournal(self.path)
+        self.journal.save(self.corpus)
+        self.committed = read_file(self.path)
+        self.saved = make_corpus(20)
+
+        self.corpus.add_sign(new_sign(300))
+        self.corpus.remove_sign(self.corpus.get_sign_by_gloss('sign0000004'))
+        save_without_commit(self.journal, self.corpus)
+        self.torn = read_file(self.path)
+
+    def test_partial_append_is_dropped(self):
+        write_file(self.path, self.torn[:-5])
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                journal = CorpusJournal(self.path)
+                loaded = journal.load(lazy=lazy)
+                self.assertSameSigns(loaded, self.saved)
+                self.assertIn('lost', journal.recovery_notes[0])
+
+    def test_corrupt_append_is_dropped(self):
+        torn = bytearray(self.torn)
+        torn[-20] ^= 0xff
+        write_file(self.path, bytes(torn))
+        self.assertSameSigns(CorpusJournal(self.path).load(), self.saved)
+
+    def test_next_save_cuts_off_partial_append(self):
+        write_file(self.path, self.torn[:-5])
+        journal = CorpusJournal(self.path)
+        loaded = journal.load()
+        sign = new_sign(400)
+        loaded.add_sign(sign)
+        journal.save(loaded)
+        self.saved.add_sign(sign)
+        self.assertTrue(read_file(self.path).startswith(self.committed))
+        self.assertLoads(self.saved)
+
+    def test_intact_append_is_replayed(self):
+        self.assertLoads(self.corpus)
+        # loading only reads the file
+        self.assertEqual(read_file(self.path), self.torn)
+
+        journal = CorpusJournal(self.path)
+        journal.load()
+        self.assertIn('replayed', journal.recovery_notes[0])
+
+    def test_save_after_replay(self):
+        journal = CorpusJournal(self.path)
+        loaded = journal.load()
+        sign = new_sign(500)
+        loaded.add_sign(sign)
+        self.corpus.add_sign(sign)
+        journal.save(loaded)
+        self.assertLoads(self.corpus)
+
+    def test_recover_commits_intact_append(self):
+        write_file(self.path, self.torn + b'\x00garbage')
+        journal = CorpusJournal(self.path)
+        journal.recover()
+        self.assertIn('completed', journal.recovery_notes[0])
+
+        journal = CorpusJournal(self.path)
+        loaded = journal.load()
+        self.assertFalse(journal.recovery_notes)
+        self.assertEqual(journal.end_offset, os.path.getsize(self.path))
+        self.assertSameSigns(loaded, self.corpus)
+
+    def test_recover_leaves_partial_append(self):
+        write_file(self.path, self.torn[:-5])
+        journal = CorpusJournal(self.path)
+        journal.recover()
+        self.assertFalse(journal.recovery_notes)
+        self.assertEqual(read_file(self.path), self.torn[:-5])
+
+
+class InterruptedCompactionTest(JournalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.journal = CorpusJournal(self.path)
+        self.journal.save(self.corpus)
+        self.saved = read_file(self.path)
+        self.corpus.remove_sign(self.corpus.get_sign_by_gloss('sign0000007'))
+        with patch.object(corpus_io.os, 'replace', side_effect=KeyboardInterrupt):
+            try:
+                self.journal.compact(self.corpus)
+            except KeyboardInterrupt:
+                pass
+        self.temp_path = self.path + '.tmp'
+
+    def test_load_leaves_snapshot(self):
+        self.assertTrue(os.path.exists(self.temp_path))
+        CorpusJournal(self.path).load()
+        self.assertTrue(os.path.exists(self.temp_path))
+        self.assertEqual(read_file(self.path), self.saved)
+
+    def test_recover_completes_snapshot(self):
+        journal = CorpusJournal(self.path)
+        journal.recover()
+        self.assertIn('compaction', journal.recovery_notes[0])
+        self.assertFalse(os.path.exists(self.temp_path))
+        self.assertLoads(self.corpus)
+
+    def test_recover_leaves_incomplete_snapshot(self):
+        temp = read_file(self.temp_path)
+        write_file(self.temp_path, temp[:-corpus_io.RECORD_HEADER.size])
+        CorpusJournal(self.path).recover()
+        self.assertTrue(os.path.exists(self.temp_path))
+        self.assertEqual(read_file(self.path), self.saved)
+
+
+class CodecTest(JournalTestCase):
+    def test_each_codec(self):
+        for codec in CODECS:
+            with self.subTest(codec=codec):
+                journal = CorpusJournal(self.path, codec=codec)
+                journal.save(self.corpus)
+                self.corpus.add_sign(new_sign(600))
+                journal.save(self.corpus)
+
+                loaded_journal = CorpusJournal(self.path)
+                loaded_journal.load()
+                self.assertEqual(loaded_journal.file_codec, codec)
+                self.assertLoads(self.corpus)
+                os.remove(self.path)
+
+    def test_codec_change_rewrites_file(self):
+        CorpusJournal(self.path, codec='none').save(self.corpus)
+        journal = CorpusJournal(self.path, codec='zlib')
+        loaded = journal.load()
+        journal.save(loaded)
+        self.assertEqual(journal.file_codec, 'zlib')
+        self.assertEqual(journal.record_count, len(self.corpus) + 3)
+        self.assertLoads(self.corpus)
+
+    def test_loaded_file_keeps_codec(self):
+        CorpusJournal(self.path, codec='bz2').save(self.corpus)
+        journal = CorpusJournal(self.path)
+        loaded = journal.load(lazy=True)
+        loaded.add_sign(new_sign(700))
+        journal.save(loaded)
+        self.assertEqual(journal.file_codec, 'bz2')
+        with open(self.path, 'rb') as f:
+            self.assertEqual(corpus_io.read_header(f)[1], 'bz2')
+
+
+class FileFormatTest(JournalTestCase):
+    def test_legacy_pickle(self):
+        with open(self.path, 'wb') as f:
+            pickle.dump(self.corpus, f)
+        journal = CorpusJournal(self.path)
+        loaded = journal.load()
+        self.assertSameSigns(loaded, self.corpus)
+
+        # the first save rewrites it as a snapshot
+        journal.save(loaded)
+        self.assertTrue(read_file(self.path).startswith(MAGIC))
+        self.assertLoads(self.corpus)
+
+    def test_truncated_header(self):
+        write_file(self.path, MAGIC + b'\x00\x00')
+        with self.assertRaises(ValueError):
+            CorpusJournal(self.path).load()
+
+    def test_unknown_version(self):
+        CorpusJournal(self.path).save(self.corpus)
+        write_file(self.path, MAGIC_PREFIX + b'\x7f' + read_file(self.path)[len(MAGIC):])
+        with self.assertRaises(ValueError):
+            CorpusJournal(self.path).load()
+
+    def test_unknown_codec(self):
+        CorpusJournal(self.path).save(self.corpus)
+        content = read_file(self.path)
+        offset = len(MAGIC) + corpus_io.TOC_POINTER.size
+        write_file(self.path, content[:offset] + b'\xff' + content[offset + 1:])
+        with self.assertRaises(ValueError):
+            CorpusJournal(self.path).load()
@@ -0,0 +1,76 @@
+import csv
+import os
+import tempfile
+from unittest import TestCase
+
+from benchmark.synthetic import make_corpus
+from lexicon.csv_export import SIGN_HEADER, export_csv, get_header
+from lexicon.csv_import import import_csv
+from lexicon.lexicon_classes import Corpus
+
+
+class CsvImportTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'signs.csv')
+        self.corpus = make_corpus(30)
+
+    def read_rows(self):
+        with open(self.path, newline='') as f:
+            return list(csv.reader(f))
+
+    def write_rows(self, rows):
+        with open(self.path, 'w', newline='') as f:
+            csv.writer(f).writerows(rows)
+
+    def test_export_then_import(self):
+        self.assertEqual(export_csv(self.corpus, self.path, 'individual'), len(self.corpus))
+        imported_corpus = Corpus()
+        imported, problems = import_csv(self.path, imported_corpus)
+
+        self.assertEqual(imported, len(self.corpus))
+        self.assertEqual(problems, [])
+        self.assertEqual(list(imported_corpus.get_sign_glosses()), list(self.corpus.get_sign_glosses()))
+        for sign in self.corpus:
+            imported_sign = imported_corpus.get_sign_by_gloss(sign.lexical_information.gloss)
+            # the CSV does not carry the estimate/uncertain flags of the slots
+            self.assertEqual(imported_sign.handshape_transcription.codes, sign.handshape_transcription.codes)
+            self.assertEqual(imported_sign.lexical_information.__getstate__(),
+                             sign.lexical_information.__getstate__())
+
+    def test_rows_with_problems_are_left_out(self):
+        export_csv(self.corpus, self.path, 'individual')
+        rows = self.read_rows()
+        header = rows[0]
+        slot_column = header.index('C1H1_S6')
+        rows[2][slot_column] = 'Q'
+        rows[3] = rows[3][:5]
+        rows[4][header.index('FOREARM')] = 'maybe'
+        rows[5][0] = ''
+        self.write_rows(rows)
+
+        corpus = Corpus()
+        imported, problems = import_csv(self.path, corpus)
+        self.assertEqual(imported, len(self.corpus) - 4)
+        self.assertEqual([problem[0] for problem in problems], [3, 4, 5, 6])
+        self.assertEqual(problems[0], (3, 'C1H1_S6', 'Q'))
+        for row in rows[2:5]:
+            self.assertFalse(corpus.has_gloss(row[0]))
+
+    def test_repeated_gloss_keeps_last_row(self):
+        export_csv(self.corpus, self.path, 'individual')
+        rows = self.read_rows()
+        rows.append(list(rows[1]))
+        rows[-1][SIGN_HEADER.index('CODER')] = 'last'
+        self.write_rows(rows)
+
+        corpus = Corpus()
+        import_csv(self.path, corpus)
+        self.assertEqual(len(corpus), len(self.corpus))
+        self.assertEqual(corpus.get_sign_by_gloss(rows[1][0]).lexical_information.coder, 'last')
+
+    def test_missing_columns(self):
+        self.write_rows([get_header('single')])
+        with self.assertRaises(ValueError):
+            import_csv(self.path, Corpus())
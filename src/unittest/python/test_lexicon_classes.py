@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from benchmark.synthetic import iter_flat_signs, to_sign_dicts
+from lexicon.lexicon_classes import HandshapeTranscription, Sign
+
+
+class FlatConstructionTest(TestCase):
+    def test_from_flat_matches_nested_dicts(self):
+        for arguments in iter_flat_signs(50):
+            flat = Sign.from_flat(*arguments)
+            nested = Sign(*to_sign_dicts(*arguments))
+            self.assertEqual(flat.lexical_information.__getstate__(), nested.lexical_information.__getstate__())
+            self.assertEqual(flat.global_handshape_information.__getstate__(),
+                             nested.global_handshape_information.__getstate__())
+            self.assertEqual(flat.handshape_transcription, nested.handshape_transcription)
+            self.assertEqual(flat.handshape_transcription.config1.hand1.get_hand_transcription_list(),
+                             nested.handshape_transcription.config1.hand1.get_hand_transcription_list())
+
+    def test_from_symbols_keeps_flags(self):
+        for arguments in iter_flat_signs(50):
+            symbols, estimate_flags, uncertain_flags = arguments[6:]
+            transcription = HandshapeTranscription.from_symbols(symbols, estimate_flags, uncertain_flags)
+            self.assertEqual(transcription, Sign(*to_sign_dicts(*arguments)).handshape_transcription)
+
+    def test_from_symbols_checks_length(self):
+        with self.assertRaises(ValueError):
+            HandshapeTranscription.from_symbols(['_'] * 10)